@@ -7,7 +7,14 @@ import time
 import logging
 import spidev as SPI
 sys.path.append("..")
+# samples/ (four levels up) holds the ai-pet event bus client
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
 from lib import LCD_1inch8
+from event_bus import MOUTH, TTS_FINISHED, BusClient
+from frame_bank import FrameBank
+from lcd_renderer import LCDRenderer
+from lip_sync import MouthTimeline
+from sprites import Sprite, find_sprite
 from PIL import Image,ImageDraw,ImageFont
 
 # Raspberry Pi pin configuration:
@@ -78,58 +85,69 @@ try:
     disp.ShowImage(im_r)
     time.sleep(3)
 
-    # --- Monitor tts.wav size and show animation when changed ---
+    # --- Lip-synced animation: the talking GIF plays while the pet's mouth is open ---
     gif_idle = '/home/charles/ai-pet/stt/whisper.cpp/samples/characters/character0.gif'
     gif_notify = '/home/charles/ai-pet/stt/whisper.cpp/samples/characters/character1.gif'
-    tts_path = '/home/charles/ai-pet/stt/whisper.cpp/piper/tts.wav'
 
-    def show_gif_on_lcd(gif_path, seconds=3):
+    # GIFs are decoded and converted to RGB565 once (and cached on disk across restarts);
+    # from here on the renderer thread owns the display and paces the frames
+    renderer = LCDRenderer(disp).start()
+
+    def load_bank(gif_path):
         if not os.path.exists(gif_path):
             logging.info("GIF not found: %s", gif_path)
-            return
+            return None
         try:
-            from PIL import ImageSequence
-            gif = Image.open(gif_path)
-            end_time = time.time() + seconds
-            # Loop through frames until timeout
-            while time.time() < end_time:
-                for frame in ImageSequence.Iterator(gif):
-                    frame_rgb = frame.convert('RGB').resize((disp.width, disp.height))
-                    disp.ShowImage(frame_rgb)
-                    duration = frame.info.get('duration', 100) / 1000.0
-                    # don't sleep past end_time
-                    remaining = end_time - time.time()
-                    if remaining <= 0:
-                        break
-                    time.sleep(min(duration, remaining))
-                    if time.time() >= end_time:
-                        break
+            # a compiled sprite (sprites.py --panel 160x128) is one mmap, no GIF decode at all
+            sprite = find_sprite(gif_path)
+            track = Sprite(sprite).track("rgb565", disp.width, disp.height) if sprite else None
+            if track is not None:
+                return track
+            return FrameBank(gif_path, disp.width, disp.height)
         except Exception as e:
-            logging.info("Failed to show GIF %s: %s", gif_path, e)
+            logging.info("Failed to load GIF %s: %s", gif_path, e)
+            return None
 
-    # Optionally show idle character briefly
-    show_gif_on_lcd(gif_idle, seconds=10)
+    idle = load_bank(gif_idle)
+    talk = load_bank(gif_notify) or idle
 
-    prev_size = None
-    # Monitor file size; on change show notification GIF
-    try:
-        while True:
-            try:
-                size = os.path.getsize(tts_path)
-            except Exception:
-                size = 0
+    # Mouth levels arrive ahead of the audio with the monotonic time each sentence
+    # starts playing, so the mouth is looked up for the time a frame will be on screen
+    mouth = MouthTimeline()
 
-            if prev_size is None:
-                prev_size = size
+    def on_event(event):
+        if event["type"] == MOUTH:
+            mouth.add(event)
+        else:
+            mouth.clear()
 
-            if size != prev_size:
-                logging.info("tts.wav size changed: %s -> %s", prev_size, size)
-                show_gif_on_lcd(gif_notify, seconds=2)
-                prev_size = size
+    BusClient().subscribe(on_event, types=[MOUTH, TTS_FINISHED])
 
-            time.sleep(1)
+    TICK = 0.02     # how often the mouth is checked
+    LEAD = 0.02     # frames are submitted this far ahead of their time
+    try:
+        current, index, next_frame = None, 0, 0.0
+        at = time.monotonic()
+        while idle is not None:
+            bank = talk if mouth.is_open(at) else idle
+            if bank is not current:
+                if current is talk:
+                    logging.info("LCD renderer: %s", renderer.stats())
+                current, index, next_frame = bank, 0, at
+            if at >= next_frame:
+                renderer.submit(bank[index], at=at)
+                next_frame = at + bank.durations[index]
+                index = (index + 1) % len(bank)
+            at += TICK
+            delay = at - LEAD - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -1:
+                at = time.monotonic()   # fell far behind (suspended?): resync
     except Exception as e:
-        logging.info("Monitor loop stopped: %s", e)
+        logging.info("Animation loop stopped: %s", e)
+
+    renderer.stop()
 
     disp.module_exit()
     logging.info("quit:")
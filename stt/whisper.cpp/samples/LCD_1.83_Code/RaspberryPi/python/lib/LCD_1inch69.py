@@ -2,9 +2,33 @@
 import time
 from . import lcdconfig
 
+INIT_SEQUENCE = (
+    # (command, data bytes[, delay s])
+    (0x36, [0x08]),
+    (0x3A, [0x05]),
+    (0xB2, [0x0B, 0x0B, 0x00, 0x33, 0x35]),
+    (0xB7, [0x11]),
+    (0xBB, [0x35]),
+    (0xC0, [0x2C]),
+    (0xC2, [0x01]),
+    (0xC3, [0x0D]),
+    (0xC4, [0x20]),  # VDV, 0x20: 0V
+    (0xC6, [0x13]),  # 0x13: 60Hz
+    (0xD0, [0xA4, 0xA1]),
+    (0xD6, [0xA1]),
+    (0xE0, [0xF0, 0x06, 0x0B, 0x0A, 0x09, 0x26, 0x29, 0x33, 0x41, 0x18, 0x16, 0x15, 0x29, 0x2D]),
+    (0xE1, [0xF0, 0x04, 0x08, 0x08, 0x07, 0x03, 0x28, 0x32, 0x40, 0x3B, 0x19, 0x18, 0x2A, 0x2E]),
+    (0xE4, [0x25, 0x00, 0x00]),
+    (0x21, []),
+    (0x11, [], 0.1),
+    (0x29, []),
+)
+
+
 class LCD_1inch69(lcdconfig.RaspberryPi):
     width = 240
     height = 280 
+    PORTRAIT_MADCTL = 0x08
     
     def command(self, cmd):
         self.digital_write(self.DC_PIN, False)
@@ -27,93 +51,8 @@ class LCD_1inch69(lcdconfig.RaspberryPi):
         """Initialize dispaly"""  
         self.module_init()
         self.reset()
+        self.send_sequence(INIT_SEQUENCE)
 
-        self.command(0x36)
-        self.data(0x08)
-
-        self.command(0x3A) 
-        self.data(0x05)
-
-        self.command(0xB2)
-        self.data(0x0B)
-        self.data(0x0B)
-        self.data(0x00)
-        self.data(0x33)
-        self.data(0x35)
-
-        self.command(0xB7)
-        self.data(0x11) 
-
-        self.command(0xBB)
-        self.data(0x35)
-
-        self.command(0xC0)
-        self.data(0x2C)
-
-        self.command(0xC2)
-        self.data(0x01)
-
-        self.command(0xC3)
-        self.data(0x0D)   
-
-        self.command(0xC4)
-        self.data(0x20) # VDV, 0x20: 0V
-
-        self.command(0xC6)
-        self.data(0x13) # 0x13: 60Hz 
-
-        self.command(0xD0)
-        self.data(0xA4)
-        self.data(0xA1)
-
-        self.command(0xD6)
-        self.data(0xA1)
-
-        self.command(0xE0)
-        self.data(0xF0)
-        self.data(0x06)
-        self.data(0x0B)
-        self.data(0x0A)
-        self.data(0x09)
-        self.data(0x26)
-        self.data(0x29)
-        self.data(0x33)
-        self.data(0x41)
-        self.data(0x18)
-        self.data(0x16)
-        self.data(0x15)
-        self.data(0x29)
-        self.data(0x2D)
-
-        self.command(0xE1)
-        self.data(0xF0)
-        self.data(0x04)
-        self.data(0x08)
-        self.data(0x08)
-        self.data(0x07)
-        self.data(0x03)
-        self.data(0x28)
-        self.data(0x32)
-        self.data(0x40)
-        self.data(0x3B)
-        self.data(0x19)
-        self.data(0x18)
-        self.data(0x2A)
-        self.data(0x2E)
-        
-        self.command(0xE4)
-        self.data(0x25)
-        self.data(0x00)
-        self.data(0x00)
-
-        self.command(0x21)
-
-        self.command(0x11)
-
-        time.sleep(0.1)
-
-        self.command(0x29)
-  
     def SetWindows(self, Xstart, Ystart, Xend, Yend, horizontal = 0):
         if horizontal:  
             #set the X coordinates
@@ -151,34 +90,19 @@ class LCD_1inch69(lcdconfig.RaspberryPi):
         imwidth, imheight = Image.size
         if imwidth == self.height and imheight ==  self.width:
             print("Landscape screen")
-            img = self.np.asarray(Image)
-            pix = self.np.zeros((self.width, self.height,2), dtype = self.np.uint8)
-            #RGB888 >> RGB565
-            pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-            pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0), self.np.right_shift(img[...,[2]],3))
-            pix = pix.flatten().tolist()
+            pix = self.rgb565(Image)
             
-            self.command(0x36)
-            self.data(0x78)
+            self.set_madctl(0x78)
             self.SetWindows(0, 0, self.height,self.width, 1)
             self.digital_write(self.DC_PIN,True)
-            for i in range(0,len(pix),4096):
-                self.spi_writebyte(pix[i:i+4096])
         else :
             print("Portrait screen")
-            img = self.np.asarray(Image)
-            pix = self.np.zeros((imheight,imwidth , 2), dtype = self.np.uint8)
-            
-            pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-            pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0), self.np.right_shift(img[...,[2]],3))
-            pix = pix.flatten().tolist()
+            pix = self.rgb565(Image)
             
-            self.command(0x36)
-            self.data(0x08)
+            self.set_madctl(0x08)
             self.SetWindows(0, 0, self.width, self.height, 0)
             self.digital_write(self.DC_PIN,True)
-        for i in range(0, len(pix), 4096):
-            self.spi_writebyte(pix[i: i+4096])
+        self.spi_writebuffer(pix)
         
 
     def clear(self):
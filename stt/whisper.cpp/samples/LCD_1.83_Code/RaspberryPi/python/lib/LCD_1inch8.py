@@ -21,6 +21,32 @@ SCAN_DIR_DFT = U2D_R2L
 LCD_WIDTH  = 160
 LCD_HEIGHT = 128
 
+INIT_SEQUENCE = (
+    # (command, data bytes[, delay s])
+    (0xB1, [0x01, 0x2C, 0x2D]),
+    (0xB2, [0x01, 0x2C, 0x2D]),
+    (0xB3, [0x01, 0x2C, 0x2D, 0x01, 0x2C, 0x2D]),
+    # Column inversion
+    (0xB4, [0x07]),
+    # ST7735R Power Sequence
+    (0xC0, [0xA2, 0x02, 0x84]),
+    (0xC1, [0xC5]),
+    (0xC2, [0x0A, 0x00]),
+    (0xC3, [0x8A, 0x2A]),
+    (0xC4, [0x8A, 0xEE]),
+    (0xC5, [0x0E]),  # VCOM
+    # ST7735R Gamma Sequence
+    (0xE0, [0x0F, 0x1A, 0x0F, 0x18, 0x2F, 0x28, 0x20, 0x22, 0x1F, 0x1B, 0x23, 0x37, 0x00, 0x07, 0x02, 0x10]),
+    (0xE1, [0x0F, 0x1B, 0x0F, 0x17, 0x33, 0x2C, 0x29, 0x2E, 0x30, 0x30, 0x39, 0x3F, 0x00, 0x07, 0x03, 0x10]),
+    # Enable test command
+    (0xF0, [0x01]),
+    # Disable ram power save mode
+    (0xF6, [0x00]),
+    # 65k mode
+    (0x3A, [0x05]),
+)
+
+
 class LCD_1inch8(lcdconfig.RaspberryPi):
     LCD_Dis_Column  = LCD_WIDTH
     LCD_Dis_Page    = LCD_HEIGHT
@@ -82,99 +108,8 @@ class LCD_1inch8(lcdconfig.RaspberryPi):
         self.data( MemoryAccessReg_Data & 0xf7)    #RGB color filter panel    
     def Init_reg(self):
         """Initialize dispaly"""  
-        self.command(0xB1)
-        self.data(0x01)
-        self.data(0x2C)
-        self.data(0x2D)
-
-        self.command(0xB2)
-        self.data(0x01)
-        self.data(0x2C)
-        self.data(0x2D)
-
-        self.command(0xB3)
-        self.data(0x01)
-        self.data(0x2C)
-        self.data(0x2D)
-        self.data(0x01)
-        self.data(0x2C)
-        self.data(0x2D)
-        
-        #Column inversion 
-        self.command(0xB4)
-        self.data(0x07)
-        
-        #ST7735R Power Sequence
-        self.command(0xC0)
-        self.data(0xA2)
-        self.data(0x02)
-        self.data(0x84)
-        self.command(0xC1)
-        self.data(0xC5)
-
-        self.command(0xC2)
-        self.data(0x0A)
-        self.data(0x00)
-
-        self.command(0xC3)
-        self.data(0x8A)
-        self.data(0x2A)
-        self.command(0xC4)
-        self.data(0x8A)
-        self.data(0xEE)
-        
-        self.command(0xC5)#VCOM 
-        self.data(0x0E)
-        
-        #ST7735R Gamma Sequence
-        self.command(0xe0)
-        self.data(0x0f)
-        self.data(0x1a)
-        self.data(0x0f)
-        self.data(0x18)
-        self.data(0x2f)
-        self.data(0x28)
-        self.data(0x20)
-        self.data(0x22)
-        self.data(0x1f)
-        self.data(0x1b)
-        self.data(0x23)
-        self.data(0x37)
-        self.data(0x00)
-        self.data(0x07)
-        self.data(0x02)
-        self.data(0x10)
+        self.send_sequence(INIT_SEQUENCE)
 
-        self.command(0xe1)
-        self.data(0x0f)
-        self.data(0x1b)
-        self.data(0x0f)
-        self.data(0x17)
-        self.data(0x33)
-        self.data(0x2c)
-        self.data(0x29)
-        self.data(0x2e)
-        self.data(0x30)
-        self.data(0x30)
-        self.data(0x39)
-        self.data(0x3f)
-        self.data(0x00)
-        self.data(0x07)
-        self.data(0x03)
-        self.data(0x10) 
-        
-        #Enable test command
-        self.command(0xF0)
-        self.data(0x01)
-        
-        #Disable ram power save mode
-        self.command(0xF6)
-        self.data(0x00)
-        
-        #65k mode
-        self.command(0x3A)
-        self.data(0x05)
-        
     def Init(self,Lcd_ScanDir=U2D_R2L):
         self.module_init()
         self.reset()
@@ -237,15 +172,10 @@ class LCD_1inch8(lcdconfig.RaspberryPi):
         if imwidth != self.width or imheight != self.height:
             raise ValueError('Image must be same dimensions as display \
                 ({0}x{1}).' .format(self.width, self.height))
-        img = self.np.asarray(Image)
-        pix = self.np.zeros((self.height,self.width,2), dtype = self.np.uint8)
-        pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-        pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0),self.np.right_shift(img[...,[2]],3))
-        pix = pix.flatten().tolist()
+        pix = self.rgb565(Image)
         self.SetWindows ( 0, 0, self.width, self.height)
         self.digital_write(self.DC_PIN,True)
-        for i in range(0,len(pix),4096):
-            self.spi_writebyte(pix[i:i+4096])	
+        self.spi_writebuffer(pix)
         '''
         self.SetWindows ( Xstart, Ystart, self.LCD_Dis_Column , self.LCD_Dis_Page  )
         self.digital_write(self.DC_PIN,self.GPIO.HIGH)
@@ -2,9 +2,48 @@
 import time
 from . import lcdconfig
 
+INIT_SEQUENCE = (
+    # (command, data bytes[, delay s])
+    (0x36, [0x08]),
+    (0xFD, [0x06, 0x08]),
+    (0x61, [0x07, 0x04]),
+    (0x62, [0x00, 0x44, 0x45]),
+    (0x63, [0x41, 0x07, 0x12, 0x12]),
+    (0x64, [0x37]),
+    (0x65, [0x09, 0x10, 0x21]),
+    (0x66, [0x09, 0x10, 0x21]),
+    (0x67, [0x20, 0x40]),
+    (0x68, [0x90, 0x4C, 0x7C, 0x66]),
+    (0xB1, [0x0F, 0x02, 0x01]),
+    (0xB4, [0x01]),
+    (0xB5, [0x02, 0x02, 0x0A, 0x14]),
+    (0xB6, [0x04, 0x01, 0x9F, 0x00, 0x02]),
+    (0xDF, [0x11]),
+    (0xE2, [0x13, 0x00, 0x00, 0x30, 0x33, 0x3F]),
+    (0xE5, [0x3F, 0x33, 0x30, 0x00, 0x00, 0x13]),
+    (0xE1, [0x00, 0x57]),
+    (0xE4, [0x58, 0x00]),
+    (0xE0, [0x01, 0x03, 0x0E, 0x0E, 0x0C, 0x15, 0x19]),
+    (0xE3, [0x1A, 0x16, 0x0C, 0x0F, 0x0E, 0x0D, 0x02, 0x01]),
+    (0xE6, [0x00, 0xFF]),
+    (0xE7, [0x01, 0x04, 0x03, 0x03, 0x00, 0x12]),
+    (0xE8, [0x00, 0x70, 0x00]),
+    (0xEC, [0x52]),
+    (0xF1, [0x01, 0x01, 0x02]),
+    (0xF6, [0x09, 0x10, 0x00, 0x00]),
+    (0xFD, [0xFA, 0xFC]),
+    (0x3A, [0x05]),
+    (0x35, [0x00]),
+    (0x21, []),
+    (0x11, [], 0.2),
+    (0x29, [], 0.01),
+)
+
+
 class LCD_1inch83(lcdconfig.RaspberryPi):
     width = 240
     height = 280 
+    PORTRAIT_MADCTL = 0x08
     
     def command(self, cmd):
         self.digital_write(self.DC_PIN, False)
@@ -27,170 +66,8 @@ class LCD_1inch83(lcdconfig.RaspberryPi):
         """Initialize dispaly""" 
         self.module_init()
         self.reset()
+        self.send_sequence(INIT_SEQUENCE)
 
-        self.command(0x36)
-        self.data(0x08)
-
-        self.command(0xfd)
-        self.data(0x06)
-        self.data(0x08)
-
-        self.command(0x61)
-        self.data(0x07)
-        self.data(0x04)
-
-        self.command(0x62)
-        self.data(0x00)
-        self.data(0x44)
-        self.data(0x45)
-
-        self.command(0x63)
-        self.data(0x41)
-        self.data(0x07)
-        self.data(0x12)
-        self.data(0x12)
-
-        self.command(0x64)
-        self.data(0x37)
-   
-        self.command(0x65)
-        self.data(0x09)
-        self.data(0x10)
-        self.data(0x21)
-     
-        self.command(0x66) 
-        self.data(0x09) 
-        self.data(0x10) 
-        self.data(0x21)
-      
-        self.command(0x67)
-        self.data(0x20)
-        self.data(0x40)
-
-       
-        self.command(0x68)
-        self.data(0x90)
-        self.data(0x4c)
-        self.data(0x7C)
-        self.data(0x66)
-
-        self.command(0xb1)
-        self.data(0x0F)
-        self.data(0x02)
-        self.data(0x01)
-
-        self.command(0xB4)
-        self.data(0x01) 
-       
-        self.command(0xB5)
-        self.data(0x02)
-        self.data(0x02)
-        self.data(0x0a)
-        self.data(0x14)
-
-        self.command(0xB6)
-        self.data(0x04)
-        self.data(0x01)
-        self.data(0x9f)
-        self.data(0x00)
-        self.data(0x02)
-  
-        self.command(0xdf)
-        self.data(0x11)
-
-        self.command(0xE2)	
-        self.data(0x13)
-        self.data(0x00) 
-        self.data(0x00)
-        self.data(0x30)
-        self.data(0x33)
-        self.data(0x3f)
-
-        self.command(0xE5)	
-        self.data(0x3f)
-        self.data(0x33)
-        self.data(0x30)
-        self.data(0x00)
-        self.data(0x00)
-        self.data(0x13)
-
-        self.command(0xE1)	
-        self.data(0x00)
-        self.data(0x57)
-
-        self.command(0xE4)	
-        self.data(0x58)
-        self.data(0x00)
-
-        self.command(0xE0)
-        self.data(0x01)
-        self.data(0x03)
-        self.data(0x0e)
-        self.data(0x0e)
-        self.data(0x0c)
-        self.data(0x15)
-        self.data(0x19)
-
-        self.command(0xE3)	
-        self.data(0x1a)
-        self.data(0x16)
-        self.data(0x0C)
-        self.data(0x0f)
-        self.data(0x0e)
-        self.data(0x0d)
-        self.data(0x02)
-        self.data(0x01)
-        
-        self.command(0xE6)
-        self.data(0x00)
-        self.data(0xff)
-
-        self.command(0xE7)
-        self.data(0x01)
-        self.data(0x04)
-        self.data(0x03)
-        self.data(0x03)
-        self.data(0x00)
-        self.data(0x12)
-
-        self.command(0xE8) 
-        self.data(0x00) 
-        self.data(0x70) 
-        self.data(0x00)
-       
-        self.command(0xEc)
-        self.data(0x52)
-
-        self.command(0xF1)
-        self.data(0x01)
-        self.data(0x01)
-        self.data(0x02)
-
-
-        self.command(0xF6)
-        self.data(0x09)
-        self.data(0x10)
-        self.data(0x00)
-        self.data(0x00)
-
-        self.command(0xfd)
-        self.data(0xfa)
-        self.data(0xfc)
-
-        self.command(0x3a)
-        self.data(0x05)
-
-        self.command(0x35)
-        self.data(0x00)
-
-
-        self.command(0x21)
-
-        self.command(0x11)
-        time.sleep(0.2)
-        self.command(0x29)
-        time.sleep(0.01)
-  
     def SetWindows(self, Xstart, Ystart, Xend, Yend, horizontal = 0):
         if horizontal:  
             #set the X coordinates
@@ -228,34 +105,19 @@ class LCD_1inch83(lcdconfig.RaspberryPi):
         imwidth, imheight = Image.size
         if imwidth == self.height and imheight ==  self.width:
             print("Landscape screen")
-            img = self.np.asarray(Image)
-            pix = self.np.zeros((self.width, self.height,2), dtype = self.np.uint8)
-            #RGB888 >> RGB565
-            pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-            pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0), self.np.right_shift(img[...,[2]],3))
-            pix = pix.flatten().tolist()
+            pix = self.rgb565(Image)
             
-            self.command(0x36)
-            self.data(0x78)
+            self.set_madctl(0x78)
             self.SetWindows(0, 0, self.height,self.width, 1)
             self.digital_write(self.DC_PIN,True)
-            for i in range(0,len(pix),4096):
-                self.spi_writebyte(pix[i:i+4096])
         else :
             print("Portrait screen")
-            img = self.np.asarray(Image)
-            pix = self.np.zeros((imheight,imwidth , 2), dtype = self.np.uint8)
-            
-            pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-            pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0), self.np.right_shift(img[...,[2]],3))
-            pix = pix.flatten().tolist()
+            pix = self.rgb565(Image)
             
-            self.command(0x36)
-            self.data(0x08)
+            self.set_madctl(0x08)
             self.SetWindows(0, 0, self.width, self.height, 0)
             self.digital_write(self.DC_PIN,True)
-        for i in range(0, len(pix), 4096):
-            self.spi_writebyte(pix[i: i+4096])
+        self.spi_writebuffer(pix)
         
 
     def clear(self):
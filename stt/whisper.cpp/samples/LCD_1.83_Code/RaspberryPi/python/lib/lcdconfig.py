@@ -30,14 +30,51 @@
 import os
 import sys
 import time
-import spidev
 import logging
 import numpy as np
-from gpiozero import *
+
+try:
+    import spidev
+except ImportError:
+    spidev = None
+try:
+    from gpiozero import DigitalOutputDevice, DigitalInputDevice, PWMOutputDevice
+except ImportError:
+    DigitalOutputDevice = DigitalInputDevice = PWMOutputDevice = None
+
+class GpiozeroBackend:
+    """Real hardware: spidev for the SPI bus, gpiozero for RST/DC/BL.
+
+    Any object with the same four methods can be passed as backend= to
+    RaspberryPi, e.g. lcdsim.SimBackend to run the drivers without a panel.
+    """
+    def spi(self, bus=0, device=0):
+        if spidev is None:
+            raise ImportError("spidev is not installed")
+        return spidev.SpiDev(bus, device)
+
+    def output(self, Pin):
+        return DigitalOutputDevice(Pin,active_high = True,initial_value =False)
+
+    def input(self, Pin, pull_up=None, active_state=True):
+        return DigitalInputDevice(Pin,pull_up=pull_up,active_state=active_state)
+
+    def pwm(self, Pin, frequency):
+        return PWMOutputDevice(Pin,frequency = frequency)
+
+#Default for spi=: SpiDev(0,0) opened through the backend (spi=None runs without SPI)
+DEFAULT_SPI = object()
 
 class RaspberryPi:
-    def __init__(self,spi=spidev.SpiDev(0,0),spi_freq=40000000,rst = 27,dc = 25,bl = 18,bl_freq=1000,i2c=None,i2c_freq=100000):
+    #MADCTL (0x36) value of the portrait orientation ShowRGB565 writes in;
+    #set by drivers whose ShowImage switches to landscape
+    PORTRAIT_MADCTL = None
+
+    def __init__(self,spi=DEFAULT_SPI,spi_freq=40000000,rst = 27,dc = 25,bl = 18,bl_freq=1000,i2c=None,i2c_freq=100000,backend=None):
         self.np=np
+        self.backend = backend if backend is not None else GpiozeroBackend()
+        if spi is DEFAULT_SPI:
+            spi = self.backend.spi(0, 0)
         self.INPUT = False
         self.OUTPUT = True
 
@@ -49,6 +86,16 @@ class RaspberryPi:
         self.BL_PIN = self.gpio_pwm(bl)
         self.bl_DutyCycle(0)
         
+        #RGB565 frame buffers, one per image shape, reused for every frame
+        self._rgb565_bufs = {}
+        self._rgb565_tmp = {}
+        #Last frame sent by ShowRGB565Diff, valid while no other SPI write happened
+        self._last_frame = None
+        self._last_frame_writes = -1
+        self._spi_writes = 0
+        #Last MADCTL value sent, None if unknown
+        self._madctl = None
+
         #Initialize SPI
         self.SPI = spi
         if self.SPI!=None :
@@ -57,9 +104,9 @@ class RaspberryPi:
 
     def gpio_mode(self,Pin,Mode,pull_up = None,active_state = True):
         if Mode:
-            return DigitalOutputDevice(Pin,active_high = True,initial_value =False)
+            return self.backend.output(Pin)
         else:
-            return DigitalInputDevice(Pin,pull_up=pull_up,active_state=active_state)
+            return self.backend.input(Pin,pull_up,active_state)
 
     def digital_write(self, Pin, value):
         if value:
@@ -74,12 +121,170 @@ class RaspberryPi:
         time.sleep(delaytime / 1000.0)
 
     def gpio_pwm(self,Pin):
-        return PWMOutputDevice(Pin,frequency = self.BL_freq)
+        return self.backend.pwm(Pin,self.BL_freq)
 
     def spi_writebyte(self, data):
+        self._spi_writes += 1
         if self.SPI!=None :
             self.SPI.writebytes(data)
 
+    def spi_writebuffer(self, data):
+        """Bulk write of a bytes-like object (bytes, numpy uint8 array, memoryview)"""
+        self._spi_writes += 1
+        if self.SPI==None :
+            return
+        if hasattr(self.SPI, "writebytes2"):
+            # spidev >= 3.5 takes the buffer directly and splits it into bufsiz transfers
+            self.SPI.writebytes2(data)
+        else:
+            data = self.np.frombuffer(data, dtype=self.np.uint8)
+            for i in range(0, len(data), 4096):
+                self.SPI.writebytes(data[i:i+4096].tolist())
+
+    def send_sequence(self, sequence):
+        """Send a table of (command, data bytes[, delay s]) entries.
+
+        Each command's parameters go out in one SPI transfer with a single DC
+        toggle, instead of one transfer and one toggle per byte.
+        """
+        for entry in sequence:
+            if entry[0] == 0x36 and entry[1]:
+                self._madctl = entry[1][0]
+            self.digital_write(self.DC_PIN, False)
+            self.spi_writebyte([entry[0]])
+            if entry[1]:
+                self.digital_write(self.DC_PIN, True)
+                self.spi_writebyte(list(entry[1]))
+            if len(entry) > 2 and entry[2]:
+                time.sleep(entry[2])
+
+    def rgb565(self, Image, out=None):
+        """Convert an RGB image to big-endian RGB565 panel data.
+
+        The result is written in place into a frame buffer kept per image
+        shape (or into out, a uint16 array of the same height x width) and
+        returned as a flat uint8 view ready for spi_writebuffer. The shared
+        buffer is overwritten by the next call with the same shape.
+        """
+        img = self.np.asarray(Image)
+        shape = img.shape[:2]
+        tmp = self._rgb565_tmp.get(shape)
+        if tmp is None:
+            tmp = self._rgb565_tmp[shape] = self.np.empty(shape, dtype=self.np.uint16)
+        pix = out
+        if pix is None:
+            pix = self._rgb565_bufs.get(shape)
+            if pix is None:
+                pix = self._rgb565_bufs[shape] = self.np.empty(shape, dtype=self.np.uint16)
+
+        # RRRRRGGG GGGBBBBB
+        self.np.bitwise_and(img[...,0], 0xF8, out=pix)
+        self.np.left_shift(pix, 8, out=pix)
+        self.np.bitwise_and(img[...,1], 0xFC, out=tmp)
+        self.np.left_shift(tmp, 3, out=tmp)
+        self.np.bitwise_or(pix, tmp, out=pix)
+        self.np.right_shift(img[...,2], 3, out=tmp)
+        self.np.bitwise_or(pix, tmp, out=pix)
+        if sys.byteorder == "little":
+            pix.byteswap(inplace=True)
+        return pix.reshape(-1).view(self.np.uint8)
+
+    def set_madctl(self, value):
+        """Send MADCTL (memory access control: rotation / mirroring) and remember it"""
+        self.digital_write(self.DC_PIN, False)
+        self.spi_writebyte([0x36])
+        self.digital_write(self.DC_PIN, True)
+        self.spi_writebyte([value])
+        self._madctl = value
+
+    def restore_portrait(self):
+        """Switch back to portrait if a landscape ShowImage left the panel rotated"""
+        if self.PORTRAIT_MADCTL is not None and self._madctl != self.PORTRAIT_MADCTL:
+            self.set_madctl(self.PORTRAIT_MADCTL)
+
+    def ShowRGB565(self, data):
+        """Write a full-screen frame that is already RGB565 panel data (see rgb565)"""
+        self.restore_portrait()
+        self.SetWindows(0, 0, self.width, self.height)
+        self.digital_write(self.DC_PIN, True)
+        self.spi_writebuffer(data)
+
+    def ShowRGB565Diff(self, data, tile=16, max_boxes=8, full_ratio=0.5):
+        """Send only the parts of a full-screen RGB565 frame that changed since the last one.
+
+        The frame is compared with the previous one in tile x tile blocks, the
+        changed tiles are merged into at most max_boxes rectangles and each is
+        sent through SetWindows. The whole frame is sent instead on the first
+        call, after any other write to the panel, or when more than full_ratio
+        of the screen changed. Returns the number of pixel bytes sent.
+        """
+        np = self.np
+        frame = np.frombuffer(data, dtype=np.uint16).reshape(self.height, self.width)
+        #a rotation change is an SPI write, so it also forces a full frame below
+        self.restore_portrait()
+        last = self._last_frame
+        if last is None or last.shape != frame.shape or self._last_frame_writes != self._spi_writes:
+            boxes = None
+        else:
+            boxes = self.dirty_boxes(last, frame, tile, max_boxes)
+            if boxes is not None and not boxes:
+                return 0
+            if boxes is not None and sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in boxes) > full_ratio * frame.size:
+                boxes = None
+
+        if boxes is None:
+            self.ShowRGB565(data)
+            sent = frame.nbytes
+        else:
+            sent = 0
+            for x0, y0, x1, y1 in boxes:
+                region = np.ascontiguousarray(frame[y0:y1, x0:x1])
+                self.SetWindows(x0, y0, x1, y1)
+                self.digital_write(self.DC_PIN, True)
+                self.spi_writebuffer(region.view(np.uint8).reshape(-1))
+                sent += region.nbytes
+
+        if last is None or last.shape != frame.shape:
+            self._last_frame = frame.copy()
+        else:
+            last[...] = frame
+        self._last_frame_writes = self._spi_writes
+        return sent
+
+    def dirty_boxes(self, old, new, tile=16, max_boxes=8, box_bytes=1024):
+        """Changed regions between two HxW frames as (x0, y0, x1, y1) pixel boxes.
+
+        Changed tiles are spanned per tile row, then neighbouring rows are
+        merged whenever that is cheaper than another SetWindows (about
+        box_bytes of pixel data) or while there are more than max_boxes.
+        """
+        np = self.np
+        h, w = new.shape
+        changed = old != new
+        if not changed.any():
+            return []
+        tiles = np.logical_or.reduceat(changed, np.arange(0, h, tile), axis=0)
+        tiles = np.logical_or.reduceat(tiles, np.arange(0, w, tile), axis=1)
+
+        boxes = []
+        for ty in np.flatnonzero(tiles.any(axis=1)).tolist():
+            cols = np.flatnonzero(tiles[ty])
+            boxes.append([int(cols[0]) * tile, ty * tile, min((int(cols[-1]) + 1) * tile, w), min((ty + 1) * tile, h)])
+
+        def area(b):
+            return (b[2] - b[0]) * (b[3] - b[1])
+
+        def union(a, b):
+            return [min(a[0], b[0]), a[1], max(a[2], b[2]), b[3]]
+
+        while len(boxes) > 1:
+            costs = [area(union(a, b)) - area(a) - area(b) for a, b in zip(boxes, boxes[1:])]
+            i = min(range(len(costs)), key=costs.__getitem__)
+            if len(boxes) <= max_boxes and costs[i] * 2 > box_bytes:
+                break
+            boxes[i:i + 2] = [union(boxes[i], boxes[i + 1])]
+        return [tuple(b) for b in boxes]
+
     def bl_DutyCycle(self, duty):
         self.BL_PIN.value = duty / 100
         
@@ -0,0 +1,198 @@
+"""In-memory SPI/GPIO backend for running the LCD drivers without a panel.
+
+    from lib import LCD_1inch83, lcdsim
+    sim = lcdsim.SimBackend()
+    disp = LCD_1inch83.LCD_1inch83(backend=sim)
+    disp.Init()
+    disp.ShowImage(image)
+    print(sim.spi_dev.stats())
+    sim.panel.save_png("frame.png")
+
+The SPI device records every command with its parameter bytes and models the
+time the transfers take on the wire at max_speed_hz. The panel follows the
+MIPI DCS window/memory-write commands (0x2A, 0x2B, 0x2C/0x3C) into a GRAM
+array, so what a driver drew can be dumped to PNG. MADCTL (0x36) rotation is
+recorded but not applied: pixels land in the address window row by row.
+"""
+
+import numpy as np
+
+CASET = 0x2A
+RASET = 0x2B
+RAMWR = 0x2C
+RAMWRC = 0x3C
+
+
+class SimPin:
+    """Stands in for gpiozero's DigitalOutputDevice/DigitalInputDevice/PWMOutputDevice."""
+
+    def __init__(self, pin, value=0, frequency=None):
+        self.pin = pin
+        self.value = value
+        self.frequency = frequency
+        self.closed = False
+
+    def on(self):
+        self.value = 1
+
+    def off(self):
+        self.value = 0
+
+    def close(self):
+        self.closed = True
+
+
+class SimPanel:
+    def __init__(self, gram_width=480, gram_height=480):
+        self.gram = np.full((gram_height, gram_width), 0xFFFF, dtype=np.uint16)
+        self.commands = []          # (command, parameter bytes); pixel data is only counted
+        self.pixel_bytes = 0
+        self.cmd = None
+        self.params = bytearray()
+        self.window = (0, 0, gram_width - 1, gram_height - 1)
+        self.cursor = 0
+        self.odd = None             # first byte of a pixel split across two writes
+        self.last_box = None        # (x0, y0, x1, y1) of the latest memory write
+
+    def write(self, dc, data):
+        data = np.frombuffer(data, dtype=np.uint8)
+        if not dc:
+            for cmd in data.tolist():
+                self._command(cmd)
+        elif self.cmd in (RAMWR, RAMWRC):
+            self._pixels(data)
+        elif self.cmd is not None:
+            self.params.extend(data.tobytes())
+            self._parameters()
+
+    def _command(self, cmd):
+        self.cmd = cmd
+        self.params = bytearray()
+        self.commands.append((cmd, self.params))
+        if cmd == RAMWR:
+            self.cursor = 0
+            self.odd = None
+
+    def _parameters(self):
+        if self.cmd in (CASET, RASET) and len(self.params) >= 4:
+            start = (self.params[0] << 8) | self.params[1]
+            end = (self.params[2] << 8) | self.params[3]
+            x0, y0, x1, y1 = self.window
+            self.window = (start, y0, end, y1) if self.cmd == CASET else (x0, start, x1, end)
+
+    def _pixels(self, data):
+        self.pixel_bytes += len(data)
+        if self.odd is not None:
+            data = np.concatenate(([self.odd], data))
+            self.odd = None
+        if len(data) % 2:
+            self.odd = data[-1]
+            data = data[:-1]
+        pix = data.view(">u2")
+        x0, y0, x1, y1 = self.window
+        x1 = min(x1, self.gram.shape[1] - 1)
+        y1 = min(y1, self.gram.shape[0] - 1)
+        if x1 < x0 or y1 < y0 or not len(pix):
+            return
+        region = self.gram[y0:y1 + 1, x0:x1 + 1]
+        area = region.size
+        flat = region.reshape(-1) if region.flags.c_contiguous else None
+        while len(pix):
+            n = min(len(pix), area - self.cursor)
+            if flat is not None:
+                flat[self.cursor:self.cursor + n] = pix[:n]
+            else:
+                idx = np.arange(self.cursor, self.cursor + n)
+                region[idx // region.shape[1], idx % region.shape[1]] = pix[:n]
+            pix = pix[n:]
+            self.cursor = (self.cursor + n) % area
+        self.last_box = (x0, y0, x1 + 1, y1 + 1)
+
+    def image(self, box=None):
+        """GRAM contents (default: the window of the latest memory write) as a PIL RGB image."""
+        from PIL import Image
+        x0, y0, x1, y1 = box or self.last_box or (0, 0, self.gram.shape[1], self.gram.shape[0])
+        pix = self.gram[y0:y1, x0:x1].astype(np.uint32)
+        rgb = np.empty(pix.shape + (3,), dtype=np.uint8)
+        rgb[..., 0] = (pix >> 11) << 3
+        rgb[..., 1] = ((pix >> 5) & 0x3F) << 2
+        rgb[..., 2] = (pix & 0x1F) << 3
+        return Image.fromarray(rgb, "RGB")
+
+    def save_png(self, path, box=None):
+        self.image(box).save(path)
+        return path
+
+
+class SimSpiDev:
+    """Stands in for spidev.SpiDev; data goes to the panel with the DC level of the backend."""
+
+    bufsiz = 4096
+
+    def __init__(self, backend, bus=0, device=0):
+        self.backend = backend
+        self.bus = bus
+        self.device = device
+        self.max_speed_hz = 500000
+        self.mode = 0
+        self.closed = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.bytes = 0
+        self.transfers = 0
+        self.bus_time = 0.0     # seconds the transfers take at max_speed_hz
+
+    def stats(self):
+        return {"bytes": self.bytes, "transfers": self.transfers, "bus_ms": self.bus_time * 1000}
+
+    def _send(self, data, length):
+        chunks = max(1, -(-length // self.bufsiz))
+        self.bytes += length
+        self.transfers += chunks
+        self.bus_time += length * 8 / self.max_speed_hz
+        self.backend.panel.write(self.backend.dc_level(), data)
+
+    def writebytes(self, data):
+        if len(data) > self.bufsiz:
+            # same limit spidev enforces on a single list transfer
+            raise OverflowError(f"Argument list size exceeds {self.bufsiz} bytes.")
+        # spidev keeps only the low byte of each value
+        self._send(bytes(v & 0xFF for v in data), len(data))
+
+    def writebytes2(self, data):
+        data = memoryview(data).cast("B")
+        self._send(data, len(data))
+
+    def close(self):
+        self.closed = True
+
+
+class SimBackend:
+    """Backend for lcdconfig.RaspberryPi(backend=...); dc must match the driver's dc pin."""
+
+    def __init__(self, dc=25, gram_width=480, gram_height=480):
+        self.dc = dc
+        self.pins = {}
+        self.panel = SimPanel(gram_width, gram_height)
+        self.spi_dev = None
+
+    def dc_level(self):
+        pin = self.pins.get(self.dc)
+        return pin.value if pin is not None else 1
+
+    def spi(self, bus=0, device=0):
+        self.spi_dev = SimSpiDev(self, bus, device)
+        return self.spi_dev
+
+    def output(self, Pin):
+        self.pins[Pin] = SimPin(Pin)
+        return self.pins[Pin]
+
+    def input(self, Pin, pull_up=None, active_state=True):
+        self.pins[Pin] = SimPin(Pin)
+        return self.pins[Pin]
+
+    def pwm(self, Pin, frequency):
+        self.pins[Pin] = SimPin(Pin, frequency=frequency)
+        return self.pins[Pin]
@@ -0,0 +1,123 @@
+"""Background camera capture with latest-frame semantics.
+
+A thread keeps calling cap.read() so the driver's queue never backs up, and
+only the newest frame is kept. The processing loop asks for a frame newer
+than the one it last handled and gets the freshest one, with the monotonic
+time it was captured; frames it was too slow for are skipped, never queued.
+
+    camera = CameraGrabber(0).start()
+    while camera.running:
+        try:
+            item = camera.read()
+        except TimeoutError:
+            continue                            # camera slow to start or stalled
+        if item is None:
+            break                               # camera closed or stopped
+        seq, captured_at, frame = item
+        ...
+    print(camera.stats())
+"""
+
+import collections
+import threading
+import time
+
+import cv2
+
+
+class CameraGrabber:
+    """Grabs from a device index, a file/URL, or an already opened VideoCapture."""
+
+    def __init__(self, source=0, stats_window=2.0):
+        self.cap = cv2.VideoCapture(source) if isinstance(source, (int, str)) else source
+        # keep the driver from buffering frames of its own where the backend allows it
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.stats_window = stats_window
+
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.frame = None
+        self.captured_at = 0.0
+        self.seq = 0                # sequence number of self.frame, 0 = nothing yet
+        self.last_read = 0          # sequence number last handed to read()
+
+        self.processed = 0
+        self.age_total = 0.0
+        self.recent_captured = collections.deque()
+        self.recent_processed = collections.deque()
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="camera-grabber", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+        self.cap.release()
+
+    def read(self, timeout=1.0):
+        """(seq, captured_at, frame) newer than the last one read, or None once capture has stopped.
+
+        Raises TimeoutError if no new frame arrives within timeout seconds (None: wait forever).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while self.seq <= self.last_read:
+                if not self.running:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"no camera frame for {timeout} s")
+                self.cond.wait(remaining)
+            now = time.monotonic()
+            self.last_read = self.seq
+            self.processed += 1
+            self.age_total += now - self.captured_at
+            self.recent_processed.append(now)
+            while now - self.recent_processed[0] > self.stats_window:
+                self.recent_processed.popleft()
+            return self.seq, self.captured_at, self.frame
+
+    def stats(self):
+        with self.cond:
+            now = time.monotonic()
+            return {
+                "capture_fps": self._fps(self.recent_captured, now),
+                "processed_fps": self._fps(self.recent_processed, now),
+                "captured": self.seq,
+                "processed": self.processed,
+                "skipped": self.seq - self.processed,
+                "age_ms": round(1000 * self.age_total / self.processed, 1) if self.processed else 0.0,
+            }
+
+    def _fps(self, recent, now):
+        while recent and now - recent[0] > self.stats_window:
+            recent.popleft()
+        span = min(self.stats_window, now - recent[0]) if recent else 0.0
+        return round(len(recent) / span, 1) if span > 0 else 0.0
+
+    def _run(self):
+        while self.running:
+            ok, frame = self.cap.read()
+            now = time.monotonic()
+            with self.cond:
+                if not ok:
+                    print("❌ Camera read failed, stopping capture")
+                    self.running = False
+                    self.cond.notify_all()
+                    return
+                self.frame = frame
+                self.captured_at = now
+                self.seq += 1
+                self.recent_captured.append(now)
+                while now - self.recent_captured[0] > self.stats_window:
+                    self.recent_captured.popleft()
+                self.cond.notify_all()
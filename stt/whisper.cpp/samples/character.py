@@ -1,40 +1,98 @@
 import os
+import queue
 import sys
 import time
 import tkinter as tk
 
+from event_bus import MOUTH, TTS_FINISHED, BusClient
+from file_watch import FileWatcher
+from lip_sync import MouthTimeline
+from sprites import Sprite, find_sprite, sprite_path
+
 try:
-	from PIL import Image, ImageTk, ImageSequence
+	from PIL import Image, ImageTk
 except Exception:
 	print("Pillow is required. Install with: pip install pillow")
 	sys.exit(1)
 
 
 class GIF:
+	"""Frames are decoded on first use and then kept while the GIF is shown.
+
+	Startup only opens the file; the frame count is learned when playback
+	first runs past the last frame. Playback cycles through every frame, so
+	all of them stay cached until release(), which the app calls when it
+	switches to the other GIF. A compiled sprite next to the GIF (sprites.py)
+	is used instead when it is up to date. reload() drops everything after
+	the file changed on disk.
+	"""
+
 	def __init__(self, path):
 		self.path = path
-		self.frames = []
-		self.durations = []
-		self._load()
-
-	def _load(self):
 		if not os.path.exists(self.path):
 			raise FileNotFoundError(self.path)
-		im = Image.open(self.path)
-		for frame in ImageSequence.Iterator(im):
-			frame_rgba = frame.convert("RGBA")
-			tkimg = ImageTk.PhotoImage(frame_rgba)
-			self.frames.append(tkimg)
-			duration = frame.info.get("duration", 100)
+		self.im = None
+		self.track = None
+		self.count = None
+		self.cache = {}	# index -> (PhotoImage, duration ms)
+
+	def reload(self):
+		if self.im is not None:
+			self.im.close()
+		self.im = None
+		self.track = None
+		self.count = None
+		self.cache.clear()
+
+	def release(self):
+		"""Drop the decoded frames; the file stays open and the frame count known."""
+		self.cache.clear()
+
+	def _open(self):
+		sprite = find_sprite(self.path)
+		if sprite is not None:
 			try:
-				duration = int(duration)
-			except Exception:
-				duration = 100
-			self.durations.append(max(1, duration))
+				self.track = Sprite(sprite).track("rgba")
+			except (OSError, ValueError) as e:
+				print(f"Ignoring {sprite}: {e}")
+			if self.track is not None:
+				self.count = len(self.track)
+				return
+		self.im = Image.open(self.path)
+
+	def frame(self, index):
+		"""(PhotoImage, duration ms) for frame index, wrapping around at the end."""
+		if self.count:
+			index %= self.count
+		hit = self.cache.get(index)
+		if hit is not None:
+			return hit
+		if self.im is None and self.track is None:
+			self._open()
+		if self.track is not None:
+			index %= self.count
+			image = Image.fromarray(self.track[index], "RGBA")
+			return self._keep(index, image, round(self.track.durations[index] * 1000))
+		try:
+			self.im.seek(index)
+		except EOFError:
+			self.count = self.im.n_frames
+			return self.frame(index % self.count)
+		duration = self.im.info.get("duration", 100)
+		try:
+			duration = int(duration)
+		except Exception:
+			duration = 100
+		return self._keep(index, self.im.convert("RGBA"), duration)
+
+	def _keep(self, index, image, duration):
+		entry = (ImageTk.PhotoImage(image), max(1, duration))
+		self.cache[index] = entry
+		return entry
 
 
 class App:
-	def __init__(self, root, gif0_path, gif1_path, watched_path):
+	def __init__(self, root, gif0_path, gif1_path, bus=None):
 		self.root = root
 		self.root.title("Character Display")
 		self.label = tk.Label(root)
@@ -42,83 +100,70 @@ class App:
 
 		self.gif0 = GIF(gif0_path)
 		self.gif1 = GIF(gif1_path)
+		self.gifs = {}
+		for g in (self.gif0, self.gif1):
+			self.gifs[os.path.abspath(g.path)] = g
+			self.gifs[os.path.abspath(sprite_path(g.path))] = g
 
 		self.current = 0
+		self.current_gif = None
 		self.frame_index = 0
-		self.watched_path = watched_path
-		self.last_size = None
-		if self.watched_path and os.path.exists(self.watched_path):
-			try:
-				self.last_size = os.path.getsize(self.watched_path)
-			except Exception:
-				self.last_size = None
-
 		self.switch_to(0)
-		self.toggling = False
-		self.toggle_interval = 10000  # ms between switches
 
+		# mouth levels of the sentences being played, published by the conversation engine
+		self.mouth = MouthTimeline()
+
+		# bus and file watch callbacks arrive on worker threads; Tk is only touched from the main loop
+		self.events = queue.Queue()
 		self._animate()
-		self._poll_watched()
+		if bus is not None:
+			bus.subscribe(self.events.put, types=[MOUTH, TTS_FINISHED])
+		# pick up edited character GIFs without a restart
+		self.watcher = FileWatcher(list(self.gifs), lambda path: self.events.put({"type": "file_changed", "path": path}))
+		self.watcher.start()
+		self._drain_events()
 
 	def switch_to(self, which):
-		if which == 0:
-			self.current_frames = self.gif0.frames
-			self.current_durations = self.gif0.durations
-		else:
-			self.current_frames = self.gif1.frames
-			self.current_durations = self.gif1.durations
+		gif = self.gif0 if which == 0 else self.gif1
+		if self.current_gif is not None and self.current_gif is not gif:
+			# only the GIF on screen keeps decoded frames
+			self.current_gif.release()
+		self.current_gif = gif
 		self.current = which
 		self.frame_index = 0
 
 	def _animate(self):
-		if not self.current_frames:
+		try:
+			img, dur = self.current_gif.frame(self.frame_index)
+		except (OSError, EOFError) as e:
+			# file being rewritten; try again once the watcher reports it
+			print(f"Cannot read {self.current_gif.path}: {e}")
+			self.current_gif.reload()
+			self.root.after(500, self._animate)
 			return
-		img = self.current_frames[self.frame_index]
 		self.label.configure(image=img)
-		dur = self.current_durations[self.frame_index]
-		self.frame_index = (self.frame_index + 1) % len(self.current_frames)
+		# the label does not keep the PhotoImage alive once release() drops it
+		self.shown = img
+		self.frame_index += 1
 		self.root.after(dur, self._animate)
 
-	def _poll_watched(self):
-		try:
-			if os.path.exists(self.watched_path):
-				# If file exists, check its size and treat creation/size change as event.
-				sz = os.path.getsize(self.watched_path)
-				if self.last_size is None:
-					# first time seeing the file: if size > 0 consider it a change
-					if sz != 0:
-						print(f"tss.wav appeared with size: {sz}")
-						self.switch_to(1)
-						# start toggling repeatedly
-						self.toggling = True
-						self._toggle_loop()
-						self.last_size = sz
-						return
-					self.last_size = sz
-				elif sz != self.last_size:
-					print(f"tss.wav size changed: {self.last_size} -> {sz}")
-					# start toggling repeatedly
-					self.switch_to(1)
-					self.toggling = True
-					self._toggle_loop()
-					self.last_size = sz
-					return
-				# If file exists and size returned to zero, stop toggling
-				if self.toggling and sz == 0:
-					self.toggling = False
-					self.switch_to(0)
-					self.last_size = sz
-					return
-		except Exception:
-			pass
-		self.root.after(500, self._poll_watched)
-
-	def _toggle_loop(self):
-		if not self.toggling:
-			return
-		next_idx = 0 if getattr(self, 'current', 0) == 1 else 1
-		self.switch_to(next_idx)
-		self.root.after(self.toggle_interval, self._toggle_loop)
+	def _drain_events(self):
+		while True:
+			try:
+				event = self.events.get_nowait()
+			except queue.Empty:
+				break
+			if event["type"] == MOUTH:
+				self.mouth.add(event)
+			elif event["type"] == TTS_FINISHED:
+				self.mouth.clear()
+			elif event["type"] == "file_changed":
+				print(f"Reloading {event['path']}")
+				self.gifs[event["path"]].reload()
+		talking = 1 if self.mouth.is_open(time.monotonic()) else 0
+		if talking != self.current:
+			self.switch_to(talking)
+		self.root.after(20, self._drain_events)
 
 
 def resource_path(filename):
@@ -128,15 +173,17 @@ def resource_path(filename):
 def main():
 	gif0 = resource_path("characters/character0.gif")
 	gif1 = resource_path("characters/character1.gif")
-	watched = resource_path("tss.wav")
 
 	for p in (gif0, gif1):
 		if not os.path.exists(p):
 			print(f"Required file missing: {p}")
 			sys.exit(1)
 
+	# keeps reconnecting until the voice loop (or event_bus.py) runs the broker
+	bus = BusClient()
+
 	root = tk.Tk()
-	app = App(root, gif0, gif1, watched)
+	app = App(root, gif0, gif1, bus=bus)
 	root.mainloop()
 
 
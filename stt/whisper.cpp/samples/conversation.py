@@ -0,0 +1,358 @@
+"""asyncio conversation engine: capture -> STT -> LLM -> TTS -> playback.
+
+Every stage is a coroutine connected to the next by a bounded asyncio.Queue;
+blocking work (arecord/VAD, the STT socket, the ollama stream, waiting for
+playback) runs in worker threads. Capture keeps running while a reply is
+being spoken, so the next utterance is picked up as soon as the pet stops;
+utterances that began while the pet was talking are treated as echo and
+dropped unless barge_in is set. With a wake_gate.WakeGate attached, a burst
+only becomes a turn when it starts with the pet's name, or while the gate is
+still open after the last wake word or reply.
+
+With an event_bus.BusClient attached, listening / wake / tts_started /
+tts_finished events are published for the displays, plus a mouth event with
+the lip_sync envelope of every sentence as it is handed to the player.
+
+With a tracing.Tracer attached, every turn is written to the trace file with
+record / stt / llm_first_sentence / llm / tts / playback / display spans and
+response_ms, the time from the end of the user's speech to the first audio.
+
+voice_loop2.py / voice_loop3.py are thin configurations of this engine.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import signal
+import threading
+import time
+
+from event_bus import LISTENING, MOUTH, TTS_FINISHED, TTS_STARTED, WAKE
+from lip_sync import MOUTH_HOP_S, mouth_levels
+from llm_stream import MODEL, OLLAMA_URL, LLMSession
+from stt_client import transcribe
+from tracing import NullTracer, NullTurn
+
+WAV_FILE = "test16k.wav"
+
+PERSONA = """You are Pickcu, a friendly, playful AI pet.
+Speak in a cheerful, gentle tone, sometimes using short playful expressions like "Purr~" or "Chirp!".
+Keep replies short, warm, and comforting.
+Ask the user questions about their day or mood occasionally.
+Do not give long technical explanations unless asked.
+Your personality is cute, curious, and supportive."""
+
+END_OF_REPLY = None
+
+
+def load_persona(default=PERSONA, path=None):
+    """Persona text from path or $AI_PET_PERSONA if set, else default."""
+    path = path or os.environ.get("AI_PET_PERSONA")
+    if path:
+        try:
+            with open(os.path.expanduser(path), "r", encoding="utf-8") as f:
+                text = f.read().strip()
+            if text:
+                return text
+        except OSError as e:
+            print(f"⚠️ Cannot read persona {path}: {e}")
+    return default
+
+
+def is_noise(text):
+    return len(text) < 2 or "BLANK_AUDIO" in text or "[" in text or "]" in text
+
+
+def clean_text(text):
+    return " ".join(text.replace("\n", " ").replace("Assistant:", "").replace("😊", "").split())
+
+
+class ConversationEngine:
+    def __init__(
+        self,
+        capture,
+        tts,
+        persona=PERSONA,
+        model=MODEL,
+        llm_url=OLLAMA_URL,
+        wav_file=WAV_FILE,
+        language="en",
+        greeting=None,
+        greet_every_turn=False,
+        on_state=None,
+        barge_in=False,
+        max_words=100,
+        queue_size=4,
+        stt_timeout=30.0,
+        llm_timeout=60.0,
+        tts_timeout=60.0,
+        tracer=None,
+        session=None,
+        wake=None,
+        wake_reply="Chirp?",
+        bus=None,
+    ):
+        self.capture = capture
+        self.tts = tts
+        self.persona = persona
+        self.model = model
+        self.llm_url = llm_url
+        self.wav_file = wav_file
+        self.language = language
+        self.greeting = greeting
+        self.greet_every_turn = greet_every_turn
+        self.on_state = on_state
+        self.barge_in = barge_in
+        self.max_words = max_words
+        self.queue_size = queue_size
+        self.stt_timeout = stt_timeout
+        self.llm_timeout = llm_timeout
+        self.tts_timeout = tts_timeout
+        self.tracer = tracer or NullTracer()
+        self.wake = wake
+        self.wake_reply = wake_reply
+        self.bus = bus
+        self.session = session or LLMSession(persona, model=model, url=llm_url, timeout=llm_timeout)
+
+        self.speaking = False
+        self.quiet_since = 0.0      # monotonic time the pet last stopped talking
+        self.stop_event = None
+        self.current_turn = NullTurn()
+        self.first_audio = None
+        self.tts.add_listener(self._on_tts)
+
+    def stop(self):
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop_event.set)
+
+        self.utterances = asyncio.Queue(maxsize=2)
+        self.turns = asyncio.Queue(maxsize=1)
+        self.sentences = asyncio.Queue(maxsize=self.queue_size)
+
+        print("🎤 Always listening... (Ctrl+C to stop)")
+        stages = [
+            asyncio.create_task(self._capture_stage(), name="capture"),
+            asyncio.create_task(self._stt_stage(), name="stt"),
+            asyncio.create_task(self._reply_stage(), name="llm"),
+            asyncio.create_task(self._speak_stage(), name="tts"),
+        ]
+        stopper = asyncio.create_task(self.stop_event.wait())
+        try:
+            await self._warm()
+            await self._set_state("listening")
+            await self._greet()
+            done, _ = await asyncio.wait(stages + [stopper], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            print("\n👋 Shutting down...")
+            await self._shutdown(stages + [stopper])
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+
+        for task in done:
+            if task is not stopper and not task.cancelled() and task.exception():
+                raise task.exception()
+
+    async def _shutdown(self, tasks):
+        self.tts.cancel()
+        self.capture.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.tts.close()
+        self.capture.close()
+
+    async def _warm(self):
+        try:
+            await asyncio.wait_for(asyncio.to_thread(self.session.warm), self.llm_timeout)
+        except Exception as e:
+            print(f"⚠️ LLM warm-up skipped: {e}")
+
+    def _publish(self, event_type, **data):
+        if self.bus is not None:
+            self.bus.publish(event_type, **data)
+
+    async def _set_state(self, state):
+        if state == "listening":
+            self._publish(LISTENING)
+        if self.on_state is not None:
+            with self.current_turn.span("display", state=state):
+                await asyncio.to_thread(self.on_state, state)
+
+    def _on_tts(self, event, **info):
+        # called from PiperStream's worker threads
+        if event == "synth":
+            self.current_turn.record("tts", info["start"], info["end"], cached=info["cached"])
+        elif event == "play":
+            if self.first_audio is None:
+                self.first_audio = info["start"]
+            if self.bus is not None:
+                levels = mouth_levels(info["pcm"], self.tts.sample_rate, MOUTH_HOP_S)
+                self._publish(MOUTH, start=round(info["start"], 4), hop=MOUTH_HOP_S, levels=levels)
+
+    async def _wait_playback(self):
+        try:
+            await asyncio.wait_for(asyncio.to_thread(self.tts.wait), self.tts_timeout)
+        except asyncio.TimeoutError:
+            print("⏱ Playback timed out")
+            self.tts.cancel()
+        finally:
+            self.speaking = False
+            self.quiet_since = time.monotonic()
+            self._publish(TTS_FINISHED)
+
+    async def _say(self, text):
+        self.speaking = True
+        self._publish(TTS_STARTED, text=text)
+        self.tts.say(text)
+        await self._wait_playback()
+
+    async def _greet(self):
+        text = self.greeting() if self.greeting else None
+        if text:
+            await self._say(text)
+        print("\n🎙 Listening...")
+
+    async def _capture_stage(self):
+        while True:
+            try:
+                utt = await asyncio.to_thread(self.capture.record_utterance)
+            except EOFError:
+                return
+            if not self.barge_in and (self.speaking or utt.started < self.quiet_since):
+                continue
+            if self.utterances.full():
+                self.utterances.get_nowait()
+            self.utterances.put_nowait(utt)
+
+    async def _stt_stage(self):
+        while True:
+            utt = await self.utterances.get()
+            turn = self.tracer.new_turn()
+            turn.record("record", utt.started, utt.ended)
+            if self.wake is not None and not self.wake.is_awake():
+                try:
+                    with turn.span("wake"):
+                        woken, heard = await asyncio.wait_for(
+                            asyncio.to_thread(self.wake.check, utt.pcm), self.stt_timeout
+                        )
+                except Exception as e:
+                    print(f"❌ Wake check failed: {e!r}")
+                    continue
+                if not woken:
+                    continue
+                print("👂 Wake word heard")
+                self._publish(WAKE, text=heard)
+                if self.wake.only_name(utt.pcm, heard):
+                    if self.wake_reply:
+                        # through the reply/speak stages, so it never overlaps a reply still playing
+                        await self.turns.put((turn, utt.ended, heard, self.wake_reply))
+                    self.wake.arm()
+                    continue
+                self.wake.arm()
+            print("📝 Transcribing...")
+            try:
+                with turn.span("stt"):
+                    user_text = await asyncio.wait_for(
+                        asyncio.to_thread(transcribe, utt.pcm, self.wav_file, language=self.language),
+                        self.stt_timeout,
+                    )
+            except asyncio.TimeoutError:
+                print("⏱ STT timed out")
+                continue
+            except Exception as e:
+                print(f"❌ STT failed: {e}")
+                continue
+
+            if is_noise(user_text):
+                print("🔇 Silence / noise detected")
+                continue
+            print("👤 User:", user_text)
+            await self.turns.put((turn, utt.ended, user_text, None))
+
+    async def _reply_stage(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            turn, heard_at, user_text, fixed_reply = await self.turns.get()
+            if fixed_reply is not None:
+                await self.sentences.put((turn, heard_at, fixed_reply))
+                await self.sentences.put((turn, heard_at, END_OF_REPLY))
+                continue
+            cancel = threading.Event()
+            requested = time.monotonic()
+
+            def produce():
+                for i, sentence in enumerate(self.session.sentences(user_text)):
+                    if i == 0:
+                        turn.record("llm_first_sentence", requested, time.monotonic())
+                    fut = asyncio.run_coroutine_threadsafe(self.sentences.put((turn, heard_at, sentence)), loop)
+                    while not cancel.is_set():
+                        try:
+                            fut.result(timeout=0.5)
+                            break
+                        except concurrent.futures.TimeoutError:
+                            continue
+                    if cancel.is_set():
+                        fut.cancel()
+                        return
+
+            try:
+                await asyncio.wait_for(asyncio.to_thread(produce), self.llm_timeout)
+            except asyncio.TimeoutError:
+                print("⏱ LLM timed out")
+            except Exception as e:
+                print(f"❌ LLM failed: {e}")
+            finally:
+                cancel.set()
+                last = self.session.last
+                turn.record("llm", requested, time.monotonic(),
+                            prefill_tokens=last.get("prompt_eval_count"),
+                            prefill_ms=round(last.get("prompt_eval_duration", 0) / 1e6, 1))
+            await self.sentences.put((turn, heard_at, END_OF_REPLY))
+
+    async def _speak_stage(self):
+        while True:
+            words = 0
+            started = False
+            while True:
+                turn, heard_at, sentence = await self.sentences.get()
+                if self.current_turn is not turn:
+                    self.current_turn = turn
+                    self.first_audio = None
+                if sentence is END_OF_REPLY:
+                    break
+                sentence = clean_text(sentence)
+                if not sentence or words >= self.max_words:
+                    continue
+                sentence = " ".join(sentence.split()[:self.max_words - words])
+                words += len(sentence.split())
+                if not started:
+                    self.speaking = True
+                    self._publish(TTS_STARTED, text=sentence)
+                    print("🤖 LLM Ai:", end=" ", flush=True)
+                    await self._set_state("speaking")
+                    started = True
+                print(sentence, end=" ", flush=True)
+                self.tts.say(sentence)
+
+            if started:
+                print()
+                await self._wait_playback()
+            first_audio = self.first_audio
+            if first_audio is not None:
+                turn.record("playback", first_audio, self.quiet_since)
+            await self._set_state("listening")
+            if first_audio is not None:
+                turn.finish(response_ms=round((first_audio - heard_at) * 1000, 1))
+            else:
+                turn.finish()
+            self.current_turn = NullTurn()
+            if self.greet_every_turn:
+                await self._greet()
+            if started and self.wake is not None:
+                self.wake.arm()
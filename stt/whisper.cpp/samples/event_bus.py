@@ -0,0 +1,252 @@
+"""Local pub/sub event bus over a Unix socket.
+
+Replaces the file polling between face_r.py, the voice loop and the displays
+(watch.txt, tss.wav, piper/tts.wav). Every message is one JSON line:
+
+    {"type": "face_seen", "ts": <time.time()>, "mono": <time.monotonic()>, ...}
+
+A client that wants events first sends {"subscribe": [types...]} (an empty
+list means everything); anything else it sends is published to every other
+subscriber. The broker remembers the last event of each state-like type
+(RETAINED: who was seen last, whether the pet is listening) and replays it to
+new subscribers, so a display started late still learns the current state.
+Per-utterance stream events (mouth timelines, TTS start/finish) are not
+retained; replaying them would animate a reply that is already over.
+"mono" is CLOCK_MONOTONIC, which is shared by all processes on the machine.
+
+    python3 event_bus.py                     # run the broker
+    python3 event_bus.py --watch             # print every event
+
+If no broker is running, the voice loop starts one in-process
+(ensure_broker()); publishing never fails, events are simply dropped.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+SOCKET_PATH = "/tmp/ai-pet-bus.sock"
+
+FACE_SEEN = "face_seen"          # name, confidence
+STRANGER_SEEN = "stranger_seen"  # path of the saved snapshot
+LISTENING = "listening"
+WAKE = "wake"
+TTS_STARTED = "tts_started"      # text (first sentence)
+TTS_FINISHED = "tts_finished"
+MOUTH = "mouth"                  # start (monotonic), hop, levels (see lip_sync)
+
+# event types the broker replays to late subscribers
+RETAINED = frozenset({FACE_SEEN, LISTENING})
+
+
+def make_event(event_type, **data):
+    event = {"type": event_type, "ts": round(time.time(), 3), "mono": round(time.monotonic(), 4)}
+    event.update(data)
+    return event
+
+
+def encode(event):
+    return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class BusHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.types = None           # None: publisher only
+        self.send_lock = threading.Lock()
+        for line in self.rfile:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            if "subscribe" in msg:
+                self.types = set(msg["subscribe"] or ())
+                self.server.add(self)
+            elif "type" in msg:
+                self.server.publish(msg, sender=self)
+        self.server.remove(self)
+
+    def wants(self, event):
+        return self.types is not None and (not self.types or event["type"] in self.types)
+
+    def send(self, data):
+        with self.send_lock:
+            self.connection.sendall(data)
+
+
+class EventBroker(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path=SOCKET_PATH, retain=RETAINED):
+        self.subscribers = set()
+        self.retain = retain
+        self.retained = {}
+        self.lock = threading.Lock()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, BusHandler)
+
+    def add(self, handler):
+        with self.lock:
+            self.subscribers.add(handler)
+            retained = [e for e in self.retained.values() if handler.wants(e)]
+        for event in sorted(retained, key=lambda e: e.get("mono", 0)):
+            self._deliver(handler, encode(event))
+
+    def remove(self, handler):
+        with self.lock:
+            self.subscribers.discard(handler)
+
+    def publish(self, event, sender=None):
+        data = encode(event)
+        with self.lock:
+            if event["type"] in self.retain:
+                self.retained[event["type"]] = event
+            targets = [h for h in self.subscribers if h is not sender and h.wants(event)]
+        for handler in targets:
+            self._deliver(handler, data)
+
+    def _deliver(self, handler, data):
+        try:
+            handler.send(data)
+        except OSError:
+            self.remove(handler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def broker_running(socket_path=SOCKET_PATH):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def ensure_broker(socket_path=SOCKET_PATH):
+    """Start a broker thread in this process unless one is already serving socket_path."""
+    if broker_running(socket_path):
+        return None
+    broker = EventBroker(socket_path)
+    threading.Thread(target=broker.serve_forever, daemon=True).start()
+    return broker
+
+
+class BusClient:
+    """Publish events and/or receive them on a background thread.
+
+    The bus is optional: publish() drops events while no broker is reachable,
+    and subscriptions reconnect on their own.
+    """
+
+    def __init__(self, socket_path=SOCKET_PATH, retry_s=2.0):
+        self.socket_path = socket_path
+        self.retry_s = retry_s
+        self.sock = None
+        self.lock = threading.Lock()
+        self.next_try = 0.0
+        self.threads = []
+        self.closed = False
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def publish(self, event_type, **data):
+        payload = encode(make_event(event_type, **data))
+        with self.lock:
+            if self.sock is None:
+                if time.monotonic() < self.next_try:
+                    return False
+                try:
+                    self.sock = self._connect()
+                except OSError:
+                    self.next_try = time.monotonic() + self.retry_s
+                    return False
+            try:
+                self.sock.sendall(payload)
+                return True
+            except OSError:
+                self.sock.close()
+                self.sock = None
+                return False
+
+    def events(self, types=()):
+        """Blocking generator of events, reconnecting whenever the broker goes away."""
+        while not self.closed:
+            try:
+                sock = self._connect()
+            except OSError:
+                time.sleep(self.retry_s)
+                continue
+            with sock, sock.makefile("rb") as f:
+                sock.sendall(encode({"subscribe": list(types)}))
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+            if not self.closed:
+                time.sleep(self.retry_s)
+
+    def subscribe(self, callback, types=()):
+        """Call callback(event) from a daemon thread for every matching event."""
+        def run():
+            for event in self.events(types):
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"⚠️ Event handler failed on {event.get('type')}: {e}")
+
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        self.threads.append(t)
+        return t
+
+    def close(self):
+        self.closed = True
+        with self.lock:
+            if self.sock is not None:
+                self.sock.close()
+                self.sock = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ai-pet event bus")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--watch", action="store_true", help="print events instead of running the broker")
+    parser.add_argument("types", nargs="*", help="event types to watch (default: all)")
+    args = parser.parse_args()
+
+    if args.watch:
+        try:
+            for event in BusClient(args.socket).events(args.types):
+                print(json.dumps(event, ensure_ascii=False))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    broker = EventBroker(args.socket)
+    print(f"📡 Event bus listening on {args.socket}")
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.server_close()
+
+
+if __name__ == "__main__":
+    main()
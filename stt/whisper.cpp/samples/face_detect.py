@@ -0,0 +1,132 @@
+"""Pluggable face detectors for face_r.py.
+
+    detector = make_detector("ssd", input_size=(300, 300))
+    for x, y, w, h, score in detector.detect(frame_bgr):
+        ...
+
+    haar   OpenCV Haar cascade (haarcascades/) on the grayscale frame, optionally downscaled
+    ssd    OpenCV's ResNet-10 SSD face detector through cv2.dnn: deploy.prototxt
+           plus res10_300x300_ssd_iter_140000.caffemodel (not in the repo, see
+           AI_PET_SSD_WEIGHTS)
+
+Every detector returns (x, y, w, h, score) boxes in frame pixels, clipped to
+the frame and passed through the same non-max suppression.
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+SAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+HAAR_CASCADE = os.path.join(SAMPLES_DIR, "haarcascades", "haarcascade_frontalface_default.xml")
+SSD_PROTOTXT = os.path.join(SAMPLES_DIR, "deploy.prototxt")
+SSD_WEIGHTS = os.environ.get("AI_PET_SSD_WEIGHTS", os.path.join(SAMPLES_DIR, "res10_300x300_ssd_iter_140000.caffemodel"))
+SSD_MEAN = (104.0, 177.0, 123.0)
+
+
+def nms(boxes, iou_threshold=0.4):
+    """Greedy non-max suppression over (x, y, w, h, score) boxes, best first."""
+    if len(boxes) == 0:
+        return []
+    b = np.asarray(boxes, dtype=np.float32)
+    x0, y0 = b[:, 0], b[:, 1]
+    x1, y1 = x0 + b[:, 2], y0 + b[:, 3]
+    area = b[:, 2] * b[:, 3]
+    order = np.argsort(-b[:, 4])
+    keep = []
+    while len(order):
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(np.minimum(x1[i], x1[rest]) - np.maximum(x0[i], x0[rest]), 0, None)
+        h = np.clip(np.minimum(y1[i], y1[rest]) - np.maximum(y0[i], y0[rest]), 0, None)
+        inter = w * h
+        iou = inter / (area[i] + area[rest] - inter + 1e-6)
+        order = rest[iou <= iou_threshold]
+    return [boxes[i] for i in keep]
+
+
+def clip_box(x, y, w, h, width, height):
+    x0, y0 = max(0, int(x)), max(0, int(y))
+    x1, y1 = min(width, int(x + w)), min(height, int(y + h))
+    return x0, y0, max(0, x1 - x0), max(0, y1 - y0)
+
+
+class HaarDetector:
+    """Haar cascade on a grayscale copy of the frame scaled to input_width pixels wide (None: full size)."""
+
+    name = "haar"
+
+    def __init__(self, cascade_path=HAAR_CASCADE, input_width=None, scale_factor=1.3, min_neighbors=5,
+                 min_size=24, iou_threshold=0.4):
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise FileNotFoundError(f"cannot load Haar cascade {cascade_path}")
+        self.input_width = input_width
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+        self.iou_threshold = iou_threshold
+
+    def detect(self, frame, gray=None):
+        """Faces in a BGR frame; pass gray if the caller already has it."""
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape[:2]
+        scale = 1.0
+        if self.input_width and width > self.input_width:
+            scale = self.input_width / width
+            gray = cv2.resize(gray, (self.input_width, int(round(height * scale))), interpolation=cv2.INTER_AREA)
+        rects, neighbours = self.cascade.detectMultiScale2(
+            gray, scaleFactor=self.scale_factor, minNeighbors=self.min_neighbors,
+            minSize=(self.min_size, self.min_size),
+        )
+        boxes = []
+        for (x, y, w, h), n in zip(rects, np.ravel(neighbours)):
+            box = clip_box(x / scale, y / scale, w / scale, h / scale, width, height)
+            if box[2] and box[3]:
+                boxes.append(box + (float(n),))
+        return nms(boxes, self.iou_threshold)
+
+
+class SSDDetector:
+    """ResNet-10 SSD through cv2.dnn at input_size (w, h); smaller sizes are faster, and miss small faces."""
+
+    name = "ssd"
+
+    def __init__(self, prototxt=SSD_PROTOTXT, weights=SSD_WEIGHTS, input_size=(300, 300), confidence=0.5,
+                 iou_threshold=0.4):
+        if not os.path.exists(weights):
+            raise FileNotFoundError(f"SSD weights not found: {weights} (set AI_PET_SSD_WEIGHTS)")
+        self.net = cv2.dnn.readNetFromCaffe(prototxt, weights)
+        self.input_size = tuple(input_size)
+        self.confidence = confidence
+        self.iou_threshold = iou_threshold
+
+    def detect(self, frame, gray=None):
+        height, width = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(frame, 1.0, self.input_size, SSD_MEAN, swapRB=False, crop=False)
+        self.net.setInput(blob)
+        out = self.net.forward().reshape(-1, 7)     # [image, class, score, x0, y0, x1, y1], coords in 0..1
+        out = out[out[:, 2] >= self.confidence]
+        boxes = []
+        for _, _, score, x0, y0, x1, y1 in out.tolist():
+            box = clip_box(x0 * width, y0 * height, (x1 - x0) * width, (y1 - y0) * height, width, height)
+            if box[2] and box[3]:
+                boxes.append(box + (score,))
+        return nms(boxes, self.iou_threshold)
+
+
+DETECTORS = {
+    HaarDetector.name: HaarDetector,
+    SSDDetector.name: SSDDetector,
+}
+
+
+def make_detector(name="haar", **options):
+    try:
+        cls = DETECTORS[name]
+    except KeyError:
+        raise ValueError(f"unknown face detector {name!r} (choose from {', '.join(DETECTORS)})") from None
+    return cls(**options)
@@ -0,0 +1,100 @@
+"""Speed and recall of the face detectors over the local image corpora.
+
+Every image in images/ (enrolled people) and stranger/ (snapshots face_r.py
+took when it saw a face) contains at least one face, so recall here is the
+share of images with at least one detection; faces/img above 1 hints at false
+positives. Each configuration is timed over the same decoded images.
+
+    python3 face_detect_bench.py
+    python3 face_detect_bench.py --configs haar:640,haar:320,ssd:300,ssd:200 --repeat 3
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+
+from face_detect import make_detector
+
+CORPORA = ("images", "stranger")
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_corpus(directory, max_images=None):
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(IMAGE_EXTS):
+            continue
+        img = cv2.imread(os.path.join(directory, name))
+        if img is not None:
+            images.append(img)
+        if max_images and len(images) >= max_images:
+            break
+    return images
+
+
+def parse_config(text):
+    """"haar:320" -> ("haar", {"input_width": 320}); "ssd:300" -> ("ssd", {"input_size": (300, 300)})."""
+    name, _, size = text.partition(":")
+    options = {}
+    if size:
+        if name == "haar":
+            options["input_width"] = int(size) or None
+        else:
+            w, _, h = size.partition("x")
+            options["input_size"] = (int(w), int(h or w))
+    return name, options
+
+
+def bench(detector, images, repeat):
+    hits = faces = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        hits = faces = 0
+        for img in images:
+            found = detector.detect(img)
+            faces += len(found)
+            hits += bool(found)
+    elapsed = time.perf_counter() - start
+    n = len(images) * repeat
+    return {
+        "per_s": n / elapsed if elapsed > 0 else 0.0,
+        "ms": 1000 * elapsed / n if n else 0.0,
+        "recall": hits / len(images) if images else 0.0,
+        "faces": faces / len(images) if images else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark face detectors on images/ and stranger/")
+    parser.add_argument("--configs", default="haar:0,haar:320,ssd:300,ssd:200",
+                        help="comma-separated detector:size (haar width, 0 = full size; ssd WxH or W)")
+    parser.add_argument("--corpora", default=",".join(CORPORA))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--max-images", type=int)
+    args = parser.parse_args()
+
+    corpora = {}
+    for directory in args.corpora.split(","):
+        if os.path.isdir(directory):
+            corpora[directory] = load_corpus(directory, args.max_images)
+            print(f"📂 {directory}: {len(corpora[directory])} images")
+        else:
+            print(f"⚠️ {directory} not found, skipped")
+
+    print(f"\n{'detector':<14}{'corpus':<10}{'img/s':>8}{'ms/img':>9}{'recall':>8}{'faces/img':>11}")
+    for config in args.configs.split(","):
+        name, options = parse_config(config)
+        try:
+            detector = make_detector(name, **options)
+        except (FileNotFoundError, ValueError, cv2.error) as e:
+            print(f"{config:<14}❌ {e}")
+            continue
+        for corpus, images in corpora.items():
+            r = bench(detector, images, args.repeat)
+            print(f"{config:<14}{corpus:<10}{r['per_s']:>8.1f}{r['ms']:>9.1f}{r['recall']:>8.0%}{r['faces']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
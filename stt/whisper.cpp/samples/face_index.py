@@ -0,0 +1,216 @@
+"""Enrolled faces as a persistent embedding index.
+
+    index = FaceIndex()                         # loads faces.npz if present
+    index.sync("images", detector)              # enrolls new photos, drops removed ones
+    name, similarity = index.match(embed(gray[y:y+h, x:x+w]))
+
+Each enrollment photo is detected and cropped once; the crop becomes a
+fixed-length embedding: uniform LBP histograms over a grid of cells, square
+rooted and L2-normalised, so the dot product of two embeddings is their
+cosine similarity. Embeddings, names and the SHA-1 of the source file are
+kept in one .npz, so restarting does not touch photos that are already
+enrolled, and adding a person appends one row instead of retraining.
+
+Photos in which the detector finds no face are reported and left out of the
+index (their hashes are remembered so they are not re-detected every start).
+
+    python3 face_index.py images/               # enroll/refresh from a folder
+    python3 face_index.py --match stranger/unknown_1347.jpg
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+import cv2
+import numpy as np
+
+SAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(SAMPLES_DIR, os.environ.get("AI_PET_FACE_INDEX", "faces.npz"))
+# cosine similarity at or above which a face is taken to be that person.
+# Placeholder: on the local photos, camera snapshots of enrolled people score
+# 0.72-0.79 against their own enrollment photo and unenrolled faces score up to
+# 0.80, so no value separates them; 0.85 errs towards "Unknown". Calibrate
+# per household with a few labelled snapshots (python3 face_index.py --match).
+MATCH_THRESHOLD = float(os.environ.get("AI_PET_FACE_MATCH", "0.85"))
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+FACE_SIZE = 96      # crops are resized to FACE_SIZE x FACE_SIZE
+GRID = 6            # GRID x GRID cells, one histogram each
+UNIFORM_BINS = 59   # 58 uniform 8-bit LBP patterns + one bin for the rest
+
+
+def _uniform_table():
+    table = np.full(256, UNIFORM_BINS - 1, dtype=np.int64)
+    n = 0
+    for code in range(256):
+        bits = [(code >> i) & 1 for i in range(8)]
+        if sum(bits[i] != bits[(i + 1) % 8] for i in range(8)) <= 2:
+            table[code] = n
+            n += 1
+    return table
+
+
+UNIFORM = _uniform_table()
+EMBEDDING_SIZE = GRID * GRID * UNIFORM_BINS
+_rows = np.minimum(np.arange(FACE_SIZE) // (FACE_SIZE // GRID), GRID - 1)
+CELL_OFFSETS = (_rows[:, None] * GRID + _rows[None, :]) * UNIFORM_BINS   # histogram offset of each pixel's cell
+
+
+def embed(face_gray):
+    """Fixed-length, unit-norm embedding of a grayscale face crop."""
+    face = cv2.resize(face_gray, (FACE_SIZE + 2, FACE_SIZE + 2), interpolation=cv2.INTER_AREA)
+    face = cv2.equalizeHist(face).astype(np.int16)
+    centre = face[1:-1, 1:-1]
+    codes = np.zeros(centre.shape, dtype=np.uint8)
+    # 8 neighbours clockwise from the top-left, one bit each
+    for bit, (dy, dx) in enumerate(((0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0))):
+        codes |= (face[dy:dy + FACE_SIZE, dx:dx + FACE_SIZE] >= centre).view(np.uint8) << bit
+    hist = np.bincount((CELL_OFFSETS + UNIFORM[codes]).ravel(), minlength=EMBEDDING_SIZE)
+    vec = np.sqrt(hist.astype(np.float32))
+    return vec / (np.linalg.norm(vec) + 1e-6)
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def largest_face(gray, detector):
+    """Crop of the biggest detected face, or None if the detector finds none."""
+    faces = detector.detect(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR), gray=gray)
+    if not faces:
+        return None
+    x, y, w, h = max(faces, key=lambda f: f[2] * f[3])[:4]
+    return gray[y:y + h, x:x + w]
+
+
+class FaceIndex:
+    def __init__(self, path=INDEX_PATH, threshold=MATCH_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.embeddings = np.zeros((0, EMBEDDING_SIZE), dtype=np.float32)
+        self.names = []
+        self.hashes = []
+        self.no_face = set()        # hashes of photos the detector found no face in
+        if os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.names)
+
+    def load(self):
+        with np.load(self.path) as data:
+            embeddings = data["embeddings"]
+            if embeddings.shape[1:] != (EMBEDDING_SIZE,):
+                print(f"⚠️ {self.path} was built with another embedding, re-enrolling")
+                return
+            self.embeddings = embeddings.astype(np.float32)
+            self.names = data["names"].tolist()
+            self.hashes = data["hashes"].tolist()
+            if "no_face" in data:
+                self.no_face = set(data["no_face"].tolist())
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, embeddings=self.embeddings, names=np.array(self.names, dtype=str),
+                     hashes=np.array(self.hashes, dtype=str), no_face=np.array(sorted(self.no_face), dtype=str))
+        os.replace(tmp, self.path)
+
+    def add(self, name, face_gray, source_hash=""):
+        """Append one face; call save() to persist."""
+        self.embeddings = np.concatenate((self.embeddings, embed(face_gray)[None, :]))
+        self.names.append(name)
+        self.hashes.append(source_hash)
+
+    def remove(self, source_hash):
+        keep = [i for i, h in enumerate(self.hashes) if h != source_hash]
+        self.embeddings = self.embeddings[keep]
+        self.names = [self.names[i] for i in keep]
+        self.hashes = [self.hashes[i] for i in keep]
+
+    def enroll(self, image_path, detector, name=None):
+        """Detect, crop and add the face in image_path, unless that file is already enrolled.
+
+        Photos without a detectable face are reported and not added.
+        """
+        digest = file_hash(image_path)
+        if digest in self.hashes or digest in self.no_face:
+            return False
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            print(f"⚠️ cannot read {image_path}")
+            return False
+        face = largest_face(gray, detector)
+        if face is None:
+            print(f"⚠️ no face found in {image_path}, not enrolled")
+            self.no_face.add(digest)
+            return False
+        name = name or os.path.splitext(os.path.basename(image_path))[0]
+        self.add(name, face, digest)
+        return True
+
+    def sync(self, directory, detector):
+        """Enroll new photos in directory, forget removed or changed ones; saves if anything changed."""
+        paths = [os.path.join(directory, f) for f in sorted(os.listdir(directory))
+                 if f.lower().endswith(IMAGE_EXTS)]
+        present = {file_hash(p) for p in paths}
+        stale = [h for h in set(self.hashes) if h and h not in present]
+        for digest in stale:
+            self.remove(digest)
+        no_face = len(self.no_face)
+        self.no_face &= present
+        added = sum(self.enroll(p, detector) for p in paths)
+        if added or stale or len(self.no_face) != no_face:
+            self.save()
+        return added, len(stale)
+
+    def nearest(self, embedding):
+        """(name, cosine similarity) of the closest enrolled face, or (None, 0.0) if empty."""
+        if not self.names:
+            return None, 0.0
+        sims = self.embeddings @ embedding
+        best = int(np.argmax(sims))
+        return self.names[best], float(sims[best])
+
+    def match(self, embedding):
+        """(name, similarity) if the closest face clears the threshold, else (None, similarity)."""
+        name, similarity = self.nearest(embedding)
+        return (name if similarity >= self.threshold else None), similarity
+
+
+def main():
+    from face_detect import make_detector
+
+    parser = argparse.ArgumentParser(description="Build the face embedding index and look faces up in it")
+    parser.add_argument("directory", nargs="?", default="images", help="enrollment photos, named after the person")
+    parser.add_argument("--index", default=INDEX_PATH)
+    parser.add_argument("--detector", default=os.environ.get("AI_PET_FACE_DETECTOR", "haar"))
+    parser.add_argument("--match", nargs="*", default=[], metavar="IMG", help="report the closest person for these images")
+    args = parser.parse_args()
+
+    detector = make_detector(args.detector)
+    index = FaceIndex(args.index)
+    added, removed = index.sync(args.directory, detector)
+    print(f"📂 {args.index}: {len(index)} faces ({added} added, {removed} removed): {', '.join(sorted(set(index.names)))}")
+    failed = 0
+    for path in args.match:
+        gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        face = None if gray is None else largest_face(gray, detector)
+        if face is None:
+            print(f"❌ {path}: {'cannot read image' if gray is None else 'no face found'}")
+            failed += 1
+            continue
+        name, similarity = index.match(embed(face))
+        print(f"{path}: {name or 'Unknown'} ({similarity:.3f})")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
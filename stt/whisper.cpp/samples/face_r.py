@@ -1,77 +1,104 @@
 import cv2
 import numpy as np
 import os
-import random
+import time
+from event_bus import FACE_SEEN, STRANGER_SEEN, BusClient
+from face_detect import make_detector
+from face_index import FaceIndex, embed
+from face_track import FaceTracker
+from camera_grabber import CameraGrabber
+from stranger_store import StrangerStore, crop_face
 
-# Prepare folder for strangers
-os.makedirs("stranger", exist_ok=True)
+# Re-announce the same person at most this often
+FACE_REPUBLISH_S = 5.0
 
-# Load Haar Cascade for detection
-cascade_path = os.path.join(os.getcwd(), "haarcascades", "haarcascade_frontalface_default.xml")
-face_cascade = cv2.CascadeClassifier(cascade_path)
+# Face detector: "haar" or "ssd" (see face_detect_bench.py to pick one per device)
+FACE_DETECTOR = os.environ.get("AI_PET_FACE_DETECTOR", "haar")
+detector = make_detector(FACE_DETECTOR)
 
-# Path to known faces
+# Full detection every N frames (1 = every frame); faces are tracked with optical flow in between
+DETECT_EVERY = int(os.environ.get("AI_PET_DETECT_EVERY", "10"))
+tracker = FaceTracker(detector, detect_every=DETECT_EVERY)
+
+# Enrolled faces: photos in images/ named after the person, embedded once into faces.npz
 known_faces_dir = "./images/"
-known_names = []
-faces_train = []
-labels_train = []
-
-label_id = 0
-name_map = {}
-
-for filename in os.listdir(known_faces_dir):
-    img = cv2.imread(os.path.join(known_faces_dir, filename), cv2.IMREAD_GRAYSCALE)
-    faces_train.append(img)
-    labels_train.append(label_id)
-    name_map[label_id] = filename.split(".")[0]
-    label_id += 1
-    print(faces_train)
-# If you can't use cv2.face.LBPHFaceRecognizer_create() on Pi 5, skip recognition
-recognition_available = False
-try:
-    recognizer = cv2.face.LBPHFaceRecognizer_create()
-    recognizer.train(faces_train, np.array(labels_train))
-    recognition_available = True
-except AttributeError:
-    print("LBPH recognizer not available on this OpenCV build, using detection only")
-
-# Start camera
-cap = cv2.VideoCapture(0)
-
-while True:
- 
-    ret, frame = cap.read()
-    if not ret:
+index = FaceIndex()
+added, removed = index.sync(known_faces_dir, detector)
+print(f"📂 {len(index)} enrolled faces ({added} new, {removed} removed)")
+
+bus = BusClient()
+last_seen = {}
+
+# Stranger snapshots: face crops written on a background thread, deduplicated and rate limited
+stranger_store = StrangerStore(
+    "stranger",
+    per_minute=int(os.environ.get("AI_PET_STRANGER_PER_MIN", "6")),
+    max_bytes=int(os.environ.get("AI_PET_STRANGER_MAX_MB", "20")) * 1024 * 1024,
+    on_saved=lambda path: bus.publish(STRANGER_SEEN, path=path),
+).start()
+
+# Print capture vs processed fps this often
+STATS_EVERY_S = float(os.environ.get("AI_PET_CAMERA_STATS_S", "30"))
+
+# Start camera: frames are grabbed on a thread, the loop always gets the newest one
+camera = CameraGrabber(0).start()
+last_stats = time.monotonic()
+
+while camera.running:
+
+    try:
+        item = camera.read()
+    except TimeoutError as e:
+        # slow first frame or a stalled camera: keep waiting, and keep the window responsive
+        print(f"⚠️ {e}")
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+        continue
+    if item is None:
         break
+    seq, captured_at, frame = item
 
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, scaleFactor=1.3, minNeighbors=5)
-
-    for (x, y, w, h) in faces:
-        face_img = gray[y:y+h, x:x+w]
-
-        if recognition_available and faces_train:
-            label, confidence = recognizer.predict(face_img)
-            print(confidence)
-            if confidence < 100:
-                name = name_map[label]
-               #speak("Hi, "+name)
-                with open("watch.txt", "w", encoding="utf-8") as f:
-                    f.write(name + "\n")
-            else:
-                name = "Unknown"
-                cv2.imwrite(f"stranger/unknown_{random.randint(0,999999)}.jpg", frame)
-        #else:
-         #   name = "Face"
-          #  cv2.imwrite(f"stranger/unknown_{random.randint(0,999999)}.jpg", frame)
-
-        # Draw rectangle and label
+
+    tracks = tracker.update(frame, gray)
+    for track in tracks:
+        x, y, w, h = track.box
+
+        # recognition runs once per track, not on every frame
+        if track.name is None:
+            track.name = "Face"
+            if len(index):
+                name, similarity = index.match(embed(gray[y:y+h, x:x+w]))
+                track.confidence = similarity
+                if name:
+                    track.name = name
+                else:
+                    track.name = "Unknown"
+                    stranger_store.submit(crop_face(frame, track.box))
+
+        name = track.name
+        if name not in ("Face", "Unknown"):
+           #speak("Hi, "+name)
+            now = time.monotonic()
+            if now - last_seen.get(name, 0.0) >= FACE_REPUBLISH_S:
+                bus.publish(FACE_SEEN, name=name, confidence=round(track.confidence, 3))
+                last_seen[name] = now
+
+    # Draw rectangles and labels only once every track has been handled, so
+    # stranger crops never pick up another face's overlay
+    for track in tracks:
+        x, y, w, h = track.box
         cv2.rectangle(frame, (x, y), (x+w, y+h), (0,0,255), 2)
-        cv2.putText(frame, name, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,255,255), 2)
+        cv2.putText(frame, track.name, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,255,255), 2)
 
     cv2.imshow("Face Detection", frame)
-    if cv2.waitKey(300) & 0xFF == ord('q'):
+    if cv2.waitKey(1) & 0xFF == ord('q'):
         break
 
-cap.release()
+    if time.monotonic() - last_stats >= STATS_EVERY_S:
+        print(f"📷 {camera.stats()} 🧍 {stranger_store.stats()}")
+        last_stats = time.monotonic()
+
+camera.stop()
+stranger_store.stop()
 cv2.destroyAllWindows()
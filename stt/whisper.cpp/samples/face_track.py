@@ -0,0 +1,142 @@
+"""Detect every N frames, track faces with optical flow in between.
+
+    tracker = FaceTracker(make_detector("haar"), detect_every=10)
+    for track in tracker.update(frame, gray):
+        if track.name is None:
+            track.name = recognise(gray, track.box)     # once per track
+        x, y, w, h = track.box
+
+Full detection runs every detect_every frames, when there are no faces to
+follow, or when a track loses its features. In between, a handful of corner
+points inside each face are followed with pyramidal Lucas-Kanade flow
+(checked forwards and backwards) and the box is moved and scaled with them.
+Detections are matched to existing tracks by overlap, so a track keeps its
+identity and recognition result across detections.
+"""
+
+import itertools
+
+import cv2
+import numpy as np
+
+LK_PARAMS = dict(winSize=(15, 15), maxLevel=2,
+                 criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a[:4]
+    bx, by, bw, bh = b[:4]
+    w = min(ax + aw, bx + bw) - max(ax, bx)
+    h = min(ay + ah, by + bh) - max(ay, by)
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+class Track:
+    _ids = itertools.count(1)
+
+    def __init__(self, box, score):
+        self.id = next(self._ids)
+        self.box = tuple(int(v) for v in box)
+        self.score = score
+        self.points = None
+        self.name = None            # filled in by the caller's recogniser, once
+        self.confidence = None
+        self.frames = 0             # frames this track has been followed
+        self.lost = 0               # detection rounds in a row without a matching face
+
+
+class FaceTracker:
+    def __init__(self, detector, detect_every=10, max_points=30, min_points=6, max_fb_error=1.5,
+                 match_iou=0.3, max_lost=1):
+        self.detector = detector
+        self.detect_every = max(1, detect_every)
+        self.max_points = max_points
+        self.min_points = min_points
+        self.max_fb_error = max_fb_error
+        self.match_iou = match_iou
+        self.max_lost = max_lost
+        self.tracks = []
+        self.prev_gray = None
+        self.since_detect = 0
+        self.detections = 0         # full detector runs, for stats
+
+    def update(self, frame, gray=None):
+        """Tracks for this frame; runs the detector only when needed."""
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        tracked = self.prev_gray is not None and self.tracks and self.since_detect < self.detect_every - 1
+        if tracked:
+            tracked = self._flow(gray)
+        if tracked:
+            self.since_detect += 1
+        else:
+            self._detect(frame, gray)
+            self.since_detect = 0
+        for track in self.tracks:
+            track.frames += 1
+        self.prev_gray = gray
+        return self.tracks
+
+    def _seed(self, gray, track):
+        x, y, w, h = track.box
+        mask = np.zeros_like(gray)
+        # inner part of the box: face texture rather than background
+        mask[y + h // 8:y + h - h // 8, x + w // 6:x + w - w // 6] = 255
+        track.points = cv2.goodFeaturesToTrack(gray, maxCorners=self.max_points, qualityLevel=0.01,
+                                               minDistance=max(3, w // 20), mask=mask)
+
+    def _detect(self, frame, gray):
+        self.detections += 1
+        faces = self.detector.detect(frame, gray=gray)
+        unmatched = list(range(len(faces)))
+        kept = []
+        for track in self.tracks:
+            best = max(unmatched, key=lambda i: iou(track.box, faces[i]), default=None)
+            if best is not None and iou(track.box, faces[best]) >= self.match_iou:
+                unmatched.remove(best)
+                track.box = tuple(int(v) for v in faces[best][:4])
+                track.score = faces[best][4]
+                track.lost = 0
+                kept.append(track)
+            elif track.lost < self.max_lost:
+                track.lost += 1
+                kept.append(track)
+        kept += [Track(faces[i][:4], faces[i][4]) for i in unmatched]
+        for track in kept:
+            self._seed(gray, track)
+        self.tracks = kept
+
+    def _flow(self, gray):
+        """Move every track with LK flow; False if any track lost too many points."""
+        for track in self.tracks:
+            pts = track.points
+            if pts is None or len(pts) < self.min_points:
+                return False
+            new, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, pts, None, **LK_PARAMS)
+            back, status_back, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, new, None, **LK_PARAMS)
+            fb_error = np.linalg.norm((pts - back).reshape(-1, 2), axis=1)
+            good = (status.ravel() == 1) & (status_back.ravel() == 1) & (fb_error < self.max_fb_error)
+            if good.sum() < self.min_points:
+                return False
+            old_pts = pts.reshape(-1, 2)[good]
+            new_pts = new.reshape(-1, 2)[good]
+            dx, dy = np.median(new_pts - old_pts, axis=0)
+            # scale: median ratio of the point spreads around their centres
+            old_spread = np.linalg.norm(old_pts - old_pts.mean(axis=0), axis=1)
+            new_spread = np.linalg.norm(new_pts - new_pts.mean(axis=0), axis=1)
+            valid = old_spread > 1e-3
+            scale = float(np.median(new_spread[valid] / old_spread[valid])) if valid.any() else 1.0
+            x, y, w, h = track.box
+            cx, cy = x + w / 2 + dx, y + h / 2 + dy
+            w, h = w * scale, h * scale
+            height, width = gray.shape[:2]
+            x0, y0 = max(0, int(cx - w / 2)), max(0, int(cy - h / 2))
+            x1, y1 = min(width, int(cx + w / 2)), min(height, int(cy + h / 2))
+            if x1 - x0 < 8 or y1 - y0 < 8:
+                return False
+            track.box = (x0, y0, x1 - x0, y1 - y0)
+            track.points = new_pts.reshape(-1, 1, 2)
+        return True
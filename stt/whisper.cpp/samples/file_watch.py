@@ -0,0 +1,135 @@
+"""Call back when files change, via inotify, or by polling where it is unavailable.
+
+    watcher = FileWatcher(["characters/character0.gif"], on_change)
+    watcher.start()
+
+on_change(path) runs on the watcher thread whenever one of the paths is
+written, replaced (editors and `cp` over a file both count) or removed. The
+parent directories are watched rather than the files, so a file that is
+deleted and recreated keeps being followed. Without inotify (not Linux, or
+the watch limit reached) the files are stat()ed every poll_s seconds instead.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT = struct.Struct("iIII")       # wd, mask, cookie, len (then name)
+
+
+def _libc():
+    name = ctypes.util.find_library("c")
+    if name is None:
+        return None
+    libc = ctypes.CDLL(name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class FileWatcher:
+    def __init__(self, paths, callback, poll_s=1.0):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.poll_s = poll_s
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.mode = None
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        fd = self._inotify()
+        if fd is not None:
+            self.mode = "inotify"
+            target = lambda: self._inotify_loop(fd)
+        else:
+            self.mode = "poll"
+            target = self._poll_loop
+        self.thread = threading.Thread(target=target, name="file-watch", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def _notify(self, path):
+        try:
+            self.callback(path)
+        except Exception as e:
+            print(f"⚠️ File watch callback failed for {path}: {e}")
+
+    def _inotify(self):
+        libc = _libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        self.dirs = {}
+        for d in sorted({os.path.dirname(p) for p in self.paths}):
+            wd = libc.inotify_add_watch(fd, os.fsencode(d), WATCH_MASK)
+            if wd < 0:
+                print(f"⚠️ inotify unavailable for {d} ({os.strerror(ctypes.get_errno())}), polling instead")
+                os.close(fd)
+                return None
+            self.dirs[wd] = d
+        return fd
+
+    def _inotify_loop(self, fd):
+        wanted = set(self.paths)
+        try:
+            while not self.stop_event.is_set():
+                # short timeout so stop() is noticed
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                changed = []
+                offset = 0
+                while offset < len(data):
+                    wd, mask, _, length = EVENT.unpack_from(data, offset)
+                    offset += EVENT.size
+                    name = data[offset:offset + length].rstrip(b"\0")
+                    offset += length
+                    path = os.path.join(self.dirs.get(wd, ""), os.fsdecode(name))
+                    if path in wanted and path not in changed:
+                        changed.append(path)
+                for path in changed:
+                    self._notify(path)
+        finally:
+            os.close(fd)
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size, st.st_ino
+        except OSError:
+            return None
+
+    def _poll_loop(self):
+        last = {p: self._stat(p) for p in self.paths}
+        while not self.stop_event.wait(self.poll_s):
+            for path in self.paths:
+                current = self._stat(path)
+                if current != last[path]:
+                    last[path] = current
+                    self._notify(path)
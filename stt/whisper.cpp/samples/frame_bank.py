@@ -0,0 +1,159 @@
+"""Pre-converted RGB565 frame banks for the LCD character animations.
+
+A GIF is decoded, resized to the panel and converted to RGB565 panel data
+once; the frames and their durations are stored in one contiguous cache file
+that is memory-mapped on the next start, so neither decoding nor conversion
+happens again until the GIF or the panel size changes.
+
+Cache file layout (little-endian header, then raw panel data):
+
+    magic "AIPETFB1" | width u32 | height u32 | count u32 | durations u32[count] (ms)
+    | frames: count x height x width x 2 bytes, big-endian RGB565
+
+    bank = FrameBank("characters/character1.gif", disp.width, disp.height)
+    AnimationPlayer(disp, bank).play(seconds=2)
+"""
+
+import hashlib
+import os
+import struct
+import time
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+FRAME_CACHE_DIR = os.path.expanduser("~/.cache/ai-pet/frames")
+
+MAGIC = b"AIPETFB1"
+HEADER = struct.Struct("<8sIII")
+
+
+def to_rgb565(rgb):
+    """HxWx3 uint8 RGB -> HxW big-endian RGB565 (same bit layout as lcdconfig.rgb565)."""
+    rgb = rgb.astype(np.uint16)
+    pix = ((rgb[..., 0] & 0xF8) << 8) | ((rgb[..., 1] & 0xFC) << 3) | (rgb[..., 2] >> 3)
+    return pix.astype(">u2")
+
+
+def decode_gif(path, width, height):
+    """Yield (HxWx3 RGB frame, duration ms) for every GIF frame, resized to the panel."""
+    with Image.open(path) as im:
+        for frame in ImageSequence.Iterator(im):
+            duration = frame.info.get("duration", 100)
+            try:
+                duration = max(1, int(duration))
+            except (TypeError, ValueError):
+                duration = 100
+            rgb = frame.convert("RGB").resize((width, height))
+            yield np.asarray(rgb), duration
+
+
+class FrameBank:
+    def __init__(self, gif_path, width, height, cache_dir=FRAME_CACHE_DIR):
+        self.gif_path = os.path.abspath(gif_path)
+        self.width = width
+        self.height = height
+        self.cache_dir = cache_dir
+        self.frame_bytes = width * height * 2
+        self.cache_path = self._cache_path()
+        if not self._map():
+            self.build()
+            if not self._map():
+                raise ValueError(f"bad frame cache {self.cache_path}")
+
+    def __len__(self):
+        return len(self.durations)
+
+    def __getitem__(self, index):
+        """Frame index as a flat uint8 view into the mapped file, ready for ShowRGB565."""
+        return self.frames[index]
+
+    def _cache_path(self):
+        st = os.stat(self.gif_path)
+        key = f"{self.gif_path}|{st.st_size}|{st.st_mtime_ns}|{self.width}x{self.height}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(self.gif_path))[0]
+        return os.path.join(self.cache_dir, f"{name}-{self.width}x{self.height}-{digest}.rgb565")
+
+    def _map(self):
+        try:
+            with open(self.cache_path, "rb") as f:
+                magic, width, height, count = HEADER.unpack(f.read(HEADER.size))
+                durations = struct.unpack(f"<{count}I", f.read(4 * count))
+        except (OSError, struct.error):
+            return False
+        if magic != MAGIC or (width, height) != (self.width, self.height) or count == 0:
+            return False
+        offset = HEADER.size + 4 * count
+        if os.path.getsize(self.cache_path) != offset + count * self.frame_bytes:
+            return False
+        self.durations = [d / 1000.0 for d in durations]
+        self.frames = np.memmap(self.cache_path, dtype=np.uint8, mode="r", offset=offset,
+                                shape=(count, self.frame_bytes))
+        return True
+
+    def build(self):
+        """Decode and convert the GIF into the cache file (written atomically)."""
+        frames = []
+        durations = []
+        for rgb, duration in decode_gif(self.gif_path, self.width, self.height):
+            frames.append(to_rgb565(rgb).tobytes())
+            durations.append(duration)
+        if not frames:
+            raise ValueError(f"no frames in {self.gif_path}")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.width, self.height, len(frames)))
+            f.write(struct.pack(f"<{len(durations)}I", *durations))
+            for frame in frames:
+                f.write(frame)
+        os.replace(tmp, self.cache_path)
+        print(f"🎞 Cached {len(frames)} frames of {os.path.basename(self.gif_path)} -> {self.cache_path}")
+
+
+class AnimationPlayer:
+    """Plays a FrameBank on a display: only SPI writes and sleeps.
+
+    bank can also be the rgb565 track of a compiled sprite (sprites.py).
+    With partial=True frames go through ShowRGB565Diff, so only the tiles
+    that changed since the previous frame are sent. With a renderer
+    (lcd_renderer.LCDRenderer) the frames are submitted ahead of their target
+    times instead and the render thread paces the output.
+    """
+
+    def __init__(self, disp, bank, partial=True, renderer=None, lead=0.02):
+        self.disp = disp
+        self.bank = bank
+        self.show = disp.ShowRGB565Diff if partial else disp.ShowRGB565
+        self.renderer = renderer
+        self.lead = lead if renderer is not None else 0.0
+
+    def play(self, seconds=None, loops=None, stop=None):
+        """Play until seconds elapse, loops complete, or stop (a threading.Event) is set."""
+        start = time.monotonic()
+        end = start + seconds if seconds is not None else None
+        deadline = start
+        loop = 0
+        while loops is None or loop < loops:
+            for i, duration in enumerate(self.bank.durations):
+                frame = self.bank[i]
+                if self.renderer is not None:
+                    self.renderer.submit(frame, at=deadline)
+                else:
+                    self.show(frame)
+                deadline += duration
+                if end is not None and deadline >= end:
+                    deadline = end
+                delay = deadline - self.lead - time.monotonic()
+                if delay < 0 and self.renderer is None:
+                    deadline -= delay   # running late: don't rush the following frames
+                if stop is not None:
+                    if stop.wait(max(0.0, delay)):
+                        return
+                elif delay > 0:
+                    time.sleep(delay)
+                if end is not None and deadline >= end:
+                    return
+            loop += 1
@@ -1,72 +1,161 @@
-import os
-import tkinter as tk
-
-
-def show_init_frame(
-    gif_path="characters/character1.gif",
-    display_time_ms=None,
-    frame_delay_ms=100
-):
-    script_dir = os.path.dirname(__file__)
-    path = os.path.join(script_dir, gif_path) if not os.path.isabs(gif_path) else gif_path
-
-    if not os.path.exists(path):
-        print("GIF not found:", path)
-        return None
-
-    root = tk.Tk()
-    root.overrideredirect(True)
-    root.attributes("-topmost", True)
-
-    frames = []
-    i = 0
+"""Borderless, always-on-top character window that follows the pet's state.
 
-    # Load GIF frames
-    while True:
-        try:
-            frames.append(
-                tk.PhotoImage(file=path, format=f"gif -index {i}")
-            )
-            i += 1
-        except Exception:
-            break
-
-    if not frames:
-        root.destroy()
-        return None
-
-    label = tk.Label(root, image=frames[0], bd=0)
-    label.pack()
-
-    label.frames = frames
-    label.image = frames[0]
+One Tk root lives on its own thread for the whole session. Every GIF is
+decoded once (with Pillow, all frames in one pass) when the window starts;
+set_state() only queues the switch and returns immediately, so the voice loop
+never waits on the display.
 
-    root.update_idletasks()
+    window = CharacterWindow().start()
+    window.set_state("speaking")
+"""
 
-    # Center window
-    w = root.winfo_width()
-    h = root.winfo_height()
-    x = (root.winfo_screenwidth() // 2) - (w // 2)
-    y = (root.winfo_screenheight() // 2) - (h // 2)
-    root.geometry(f"{w}x{h}+{x}+{y}")
+import os
+import queue
+import threading
+import tkinter as tk
 
-    # Animate
-    if len(frames) > 1:
+from PIL import Image, ImageSequence, ImageTk
 
-        def animate(idx=0):
-            label.config(image=frames[idx])
-            label.image = frames[idx]
+from sprites import Sprite, find_sprite
 
-            idx = (idx + 1) % len(frames)
+STATE_GIFS = {
+    "idle": "characters/character0.gif",
+    "listening": "characters/character0.gif",
+    "speaking": "characters/character1.gif",
+}
 
-            root.after(frame_delay_ms, animate, idx)
 
-        animate()
+def resolve(path):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return path if os.path.isabs(path) else os.path.join(script_dir, path)
 
-    # Auto close
-    if display_time_ms:
-        root.after(display_time_ms, root.destroy)
 
-    root.mainloop()
+def load_frames(path, frame_delay_ms=None):
+    """Decode every frame of a GIF once: ([PhotoImage], [delay ms]). Needs a Tk root.
 
-    return root
+    A compiled sprite next to the GIF (sprites.py) is used when it is up to date.
+    """
+    frames = []
+    delays = []
+    sprite = find_sprite(path)
+    track = Sprite(sprite).track("rgba") if sprite else None
+    if track is not None:
+        for i in range(len(track)):
+            frames.append(ImageTk.PhotoImage(track.image(i)))
+            delays.append(frame_delay_ms or max(1, round(track.durations[i] * 1000)))
+        return frames, delays
+    with Image.open(path) as im:
+        for frame in ImageSequence.Iterator(im):
+            frames.append(ImageTk.PhotoImage(frame.convert("RGBA")))
+            delay = frame_delay_ms or frame.info.get("duration", 100)
+            try:
+                delay = max(1, int(delay))
+            except (TypeError, ValueError):
+                delay = 100
+            delays.append(delay)
+    return frames, delays
+
+
+class CharacterWindow:
+    def __init__(self, states=None, initial="idle", frame_delay_ms=None, topmost=True):
+        self.states = dict(states or STATE_GIFS)
+        self.initial = initial
+        self.frame_delay_ms = frame_delay_ms
+        self.topmost = topmost
+        self.requests = queue.Queue()
+        self.ready = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Open the window on a background thread; returns once the GIFs are decoded."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="character-window", daemon=True)
+            self.thread.start()
+            self.ready.wait(timeout=10)
+        return self
+
+    def set_state(self, state):
+        """Switch animation ("idle", "listening", "speaking"); never blocks."""
+        self.requests.put(state)
+
+    def close(self):
+        self.requests.put(None)
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def _run(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError as e:
+            print(f"❌ Character window unavailable: {e}")
+            self.ready.set()
+            return
+        self.root.overrideredirect(True)
+        self.root.attributes("-topmost", self.topmost)
+        self.label = tk.Label(self.root, bd=0)
+        self.label.pack()
+
+        # one decode per GIF file, shared by the states that use it
+        decoded = {}
+        self.animations = {}
+        for state, gif_path in self.states.items():
+            path = resolve(gif_path)
+            if path not in decoded:
+                try:
+                    decoded[path] = load_frames(path, self.frame_delay_ms)
+                except (OSError, ValueError) as e:
+                    print(f"Cannot load {path}: {e}")
+                    continue
+            if decoded[path][0]:
+                self.animations[state] = decoded[path]
+        self.ready.set()
+
+        self.state = None
+        self.frames, self.delays = [], []
+        self.index = 0
+        self.tick = None
+        self._switch(self.initial)
+        self._center()
+        self._poll()
+        self.root.mainloop()
+        self.root.destroy()
+
+    def _center(self):
+        self.root.update_idletasks()
+        w = self.root.winfo_width()
+        h = self.root.winfo_height()
+        x = (self.root.winfo_screenwidth() // 2) - (w // 2)
+        y = (self.root.winfo_screenheight() // 2) - (h // 2)
+        # position only, so the window still resizes to GIFs of other sizes
+        self.root.geometry(f"+{x}+{y}")
+
+    def _switch(self, state):
+        if state == self.state or state not in self.animations:
+            return
+        if self.tick is not None:
+            self.root.after_cancel(self.tick)
+            self.tick = None
+        self.state = state
+        self.frames, self.delays = self.animations[state]
+        self.index = 0
+        self._animate()
+
+    def _animate(self):
+        self.label.configure(image=self.frames[self.index])
+        delay = self.delays[self.index]
+        self.index = (self.index + 1) % len(self.frames)
+        self.tick = self.root.after(delay, self._animate) if len(self.frames) > 1 else None
+
+    def _poll(self):
+        # set_state() is called from other threads; Tk is only touched here
+        while True:
+            try:
+                state = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if state is None:
+                self.root.quit()
+                return
+            self._switch(state)
+        self.root.after(20, self._poll)
@@ -0,0 +1,99 @@
+"""Throughput of the LCD drivers on the simulated SPI/GPIO backend.
+
+Runs Init, clear and ShowImage of every driver in LCD_1.83_Code against
+lcdsim.SimBackend and prints, per operation, the CPU time spent in Python,
+the modelled SPI wire time at --spi-freq, bytes and transfers per call, and
+the resulting frame rate (writes are synchronous, so CPU and wire time add up).
+Init also sleeps for the panel's power-up delays; those are not counted.
+
+    python3 lcd_bench.py                       # all drivers
+    python3 lcd_bench.py LCD_1inch83 --frames 50 --png /tmp/lcd
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+LCD_LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "LCD_1.83_Code", "RaspberryPi", "python")
+sys.path.insert(0, LCD_LIB_DIR)
+
+from lib import lcdsim  # noqa: E402
+
+DRIVERS = sorted(name[:-3] for name in os.listdir(os.path.join(LCD_LIB_DIR, "lib")) if name.startswith("LCD_"))
+
+
+def test_images(width, height, count=2):
+    """A few distinct full-screen frames, so nothing can be skipped as unchanged."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    images = []
+    for i in range(count):
+        rgb = np.stack([(x * 255 // max(1, width - 1) + 40 * i) % 256,
+                        (y * 255 // max(1, height - 1)) % 256,
+                        rng.integers(0, 256, (height, width))], axis=-1).astype(np.uint8)
+        images.append(Image.fromarray(rgb, "RGB"))
+    return images
+
+
+def measure(spi, fn, repeat):
+    spi.reset_stats()
+    cpu = time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):     # some drivers print on every frame
+        for i in range(repeat):
+            fn(i)
+    cpu = (time.process_time() - cpu) / repeat
+    stats = spi.stats()
+    bus = stats["bus_ms"] / 1000 / repeat
+    return {
+        "cpu_ms": cpu * 1000,
+        "bus_ms": bus * 1000,
+        "bytes": stats["bytes"] // repeat,
+        "transfers": stats["transfers"] // repeat,
+        "fps": 1.0 / (cpu + bus) if cpu + bus > 0 else 0.0,
+    }
+
+
+def bench_driver(name, frames, spi_freq, png_dir=None):
+    module = importlib.import_module(f"lib.{name}")
+    sim = lcdsim.SimBackend()
+    disp = getattr(module, name)(spi_freq=spi_freq, backend=sim)
+    spi = sim.spi_dev
+    images = test_images(disp.width, disp.height)
+
+    results = {"Init": measure(spi, lambda i: disp.Init(), 1)}
+    results["clear"] = measure(spi, lambda i: disp.clear(), frames)
+    results["ShowImage"] = measure(spi, lambda i: disp.ShowImage(images[i % len(images)]), frames)
+    if png_dir:
+        os.makedirs(png_dir, exist_ok=True)
+        sim.panel.save_png(os.path.join(png_dir, f"{name}.png"))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LCD drivers on a simulated SPI bus")
+    parser.add_argument("drivers", nargs="*", default=DRIVERS, help=f"default: {' '.join(DRIVERS)}")
+    parser.add_argument("--frames", type=int, default=20, help="calls per clear/ShowImage measurement")
+    parser.add_argument("--spi-freq", type=int, default=40000000)
+    parser.add_argument("--png", metavar="DIR", help="save each driver's last ShowImage frame as DIR/<driver>.png")
+    args = parser.parse_args()
+
+    print(f"{'driver':<13}{'op':<11}{'cpu ms':>9}{'spi ms':>9}{'fps':>8}{'bytes':>9}{'xfers':>7}")
+    for name in args.drivers:
+        try:
+            results = bench_driver(name, args.frames, args.spi_freq, args.png)
+        except Exception as e:
+            print(f"{name:<13}❌ {e}")
+            continue
+        for op, r in results.items():
+            print(f"{name:<13}{op:<11}{r['cpu_ms']:>9.2f}{r['bus_ms']:>9.2f}{r['fps']:>8.1f}{r['bytes']:>9}{r['transfers']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Threaded, double-buffered LCD renderer with frame pacing.
+
+The renderer owns the display on one thread. Callers submit() frames with a
+target monotonic timestamp and return immediately. While it waits for a
+frame's target time the render thread converts that frame into the back
+buffer, so at the deadline only the SPI transfer is left. Frames whose
+successor is already due are dropped instead of being shown late, and
+fps / dropped / lateness are reported.
+
+    renderer = LCDRenderer(disp).start()
+    renderer.submit(image)                      # PIL image, shown as soon as possible
+    renderer.submit(bank[i], at=t0 + 0.15)      # RGB565 panel data, shown at t0 + 150 ms
+    print(renderer.stats())
+"""
+
+import collections
+import threading
+import time
+
+import numpy as np
+
+
+class LCDRenderer:
+    def __init__(self, disp, partial=True, max_pending=4, stats_window=2.0):
+        self.disp = disp
+        self.partial = partial
+        self.max_pending = max_pending
+        self.stats_window = stats_window
+
+        # back buffer is filled ahead of the deadline, front holds the frame last sent
+        self.buffers = [np.empty((disp.height, disp.width), dtype=np.uint16) for _ in range(2)]
+        self.back = 0
+
+        self.pending = collections.deque()
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+
+        self.shown = 0
+        self.dropped = 0
+        self.late_total = 0.0
+        self.recent = collections.deque()     # monotonic times of recently shown frames
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="lcd-renderer", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def submit(self, frame, at=None):
+        """Queue a PIL image or RGB565 panel data to be shown at monotonic time at (default: now)."""
+        at = time.monotonic() if at is None else at
+        with self.cond:
+            if len(self.pending) >= self.max_pending:
+                self.pending.popleft()
+                self.dropped += 1
+            self.pending.append((at, frame))
+            self.cond.notify()
+
+    def clear_pending(self):
+        with self.cond:
+            self.pending.clear()
+
+    def stats(self):
+        with self.cond:
+            now = time.monotonic()
+            while self.recent and now - self.recent[0] > self.stats_window:
+                self.recent.popleft()
+            span = min(self.stats_window, now - self.recent[0]) if self.recent else 0.0
+            return {
+                "fps": round(len(self.recent) / span, 1) if span > 0 else 0.0,
+                "shown": self.shown,
+                "dropped": self.dropped,
+                "late_ms": round(1000 * self.late_total / self.shown, 2) if self.shown else 0.0,
+                "pending": len(self.pending),
+            }
+
+    def _next(self):
+        """Wait for the next frame to show; drop those whose successor is already due."""
+        with self.cond:
+            while self.running:
+                if not self.pending:
+                    self.cond.wait()
+                    continue
+                now = time.monotonic()
+                while len(self.pending) > 1 and self.pending[1][0] <= now:
+                    self.pending.popleft()
+                    self.dropped += 1
+                return self.pending.popleft()
+        return None
+
+    def _prepare(self, frame):
+        if isinstance(frame, (bytes, bytearray, memoryview, np.ndarray)):
+            return frame        # already panel data, e.g. a FrameBank frame
+        buf = self.buffers[self.back]
+        data = self.disp.rgb565(frame, out=buf)
+        self.back ^= 1
+        return data
+
+    def _wait_until(self, at):
+        """Sleep until at; False if stopped meanwhile."""
+        with self.cond:
+            while self.running:
+                delay = at - time.monotonic()
+                if delay <= 0:
+                    return True
+                self.cond.wait(delay)
+        return False
+
+    def _run(self):
+        show = self.disp.ShowRGB565Diff if self.partial else self.disp.ShowRGB565
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            at, frame = item
+            try:
+                data = self._prepare(frame)
+            except Exception as e:
+                print(f"⚠️ Cannot render frame: {e}")
+                continue
+            if not self._wait_until(at):
+                return
+            started = time.monotonic()
+            try:
+                show(data)
+            except OSError as e:
+                print(f"❌ LCD write failed: {e}")
+                continue
+            with self.cond:
+                self.shown += 1
+                self.late_total += max(0.0, started - at)
+                self.recent.append(started)
@@ -0,0 +1,81 @@
+"""Mouth levels from the TTS audio, for lip-synced character animation.
+
+When a sentence is handed to the player the conversation engine computes the
+RMS envelope of its PCM in MOUTH_HOP_S windows and publishes it on the event
+bus together with the monotonic time the sentence becomes audible:
+
+    {"type": "mouth", "start": <mono>, "hop": 0.04, "levels": [0..100, ...]}
+
+Displays keep a MouthTimeline and ask it whether the mouth is open right
+now, so the animation follows the speech itself instead of file changes.
+"""
+
+import bisect
+import threading
+
+import numpy as np
+
+MOUTH_HOP_S = 0.04          # one level per 40 ms, about one animation frame
+SILENCE_DB = -45.0          # RMS (dBFS) mapped to level 0
+LOUD_DB = -15.0             # RMS (dBFS) mapped to level 100
+OPEN_LEVEL = 30             # levels at or above this count as mouth open
+
+
+def mouth_levels(pcm, sample_rate, hop_s=MOUTH_HOP_S):
+    """16-bit mono PCM -> list of 0..100 mouth levels, one per hop_s window."""
+    hop = max(1, int(sample_rate * hop_s))
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    n = -(-len(samples) // hop)
+    if n == 0:
+        return []
+    frames = np.zeros(n * hop, dtype=np.float32)
+    frames[:len(samples)] = samples
+    frames = frames.reshape(n, hop) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    db = 20 * np.log10(np.maximum(rms, 1e-6))
+    levels = np.clip((db - SILENCE_DB) / (LOUD_DB - SILENCE_DB), 0.0, 1.0)
+    return np.rint(levels * 100).astype(np.int16).tolist()
+
+
+class MouthTimeline:
+    """Mouth levels of the sentences being played, looked up by monotonic time.
+
+    add() takes "mouth" bus events (it is safe to call from the bus thread);
+    clear() drops everything, e.g. on tts_finished after a cancelled reply.
+    """
+
+    def __init__(self, open_level=OPEN_LEVEL, hold_s=0.12):
+        self.open_level = open_level
+        self.hold_s = hold_s
+        self.segments = []      # (start, end, hop, levels), sorted by start
+        self.lock = threading.Lock()
+
+    def add(self, event):
+        levels = event.get("levels") or []
+        hop = event.get("hop", MOUTH_HOP_S)
+        start = event.get("start", event.get("mono", 0.0))
+        end = start + len(levels) * hop
+        with self.lock:
+            self.segments = [s for s in self.segments if s[1] > start - 1.0]
+            bisect.insort(self.segments, (start, end, hop, levels))
+
+    def clear(self):
+        with self.lock:
+            self.segments = []
+
+    def level(self, now):
+        """Mouth level at monotonic time now (0 outside of speech)."""
+        with self.lock:
+            for start, end, hop, levels in self.segments:
+                if start <= now < end:
+                    return levels[min(len(levels) - 1, int((now - start) / hop))]
+        return 0
+
+    def is_open(self, now):
+        """Open if any level within the last hold_s reached open_level, so short dips don't flicker."""
+        t = now
+        while t >= now - self.hold_s:
+            if self.level(t) >= self.open_level:
+                return True
+            t -= MOUTH_HOP_S / 2
+        return False
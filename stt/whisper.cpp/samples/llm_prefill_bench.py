@@ -0,0 +1,98 @@
+"""Prefill cost per turn with and without persona prefix reuse.
+
+Runs the same short conversation against the local ollama server three ways
+and prints what the server reports for each turn (prompt_eval_count and
+prompt_eval_duration) plus the client-side time to first token:
+
+    cold       persona + user turn every time, model unloaded after each turn
+    stateless  persona + user turn every time, model kept loaded
+    session    LLMSession: persona once, then only the new turn via `context`
+
+    python3 llm_prefill_bench.py --model gemma3:270m --turns 6
+"""
+
+import argparse
+import time
+
+from conversation import PERSONA, load_persona
+from llm_stream import KEEP_ALIVE, MODEL, OLLAMA_URL, LLMSession, LLMStream
+
+USER_TURNS = [
+    "Hi Pickcu, I just got home.",
+    "I had a long day at work.",
+    "My boss liked my presentation though!",
+    "What should I eat for dinner?",
+    "Maybe noodles. Do you like noodles?",
+    "Okay, good night Pickcu.",
+]
+
+
+def run_turn(stream):
+    start = time.monotonic()
+    first = None
+    for _ in stream:
+        if first is None:
+            first = time.monotonic()
+    final = stream.final or {}
+    return {
+        "prompt_tokens": final.get("prompt_eval_count", 0),
+        "prefill_ms": final.get("prompt_eval_duration", 0) / 1e6,
+        "load_ms": final.get("load_duration", 0) / 1e6,
+        "first_token_ms": ((first or time.monotonic()) - start) * 1000,
+    }
+
+
+def bench(mode, persona, turns, model, url, num_predict):
+    options = {"num_predict": num_predict}
+    session = LLMSession(persona, model=model, url=url, options=options)
+    results = []
+    for user_text in turns:
+        if mode == "session":
+            stream = session.stream(user_text)
+        else:
+            keep_alive = 0 if mode == "cold" else KEEP_ALIVE
+            stream = LLMStream(user_text, model=model, url=url, fallback=False,
+                               system=persona, keep_alive=keep_alive, options=options)
+        results.append(run_turn(stream))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM prefill with and without persona reuse")
+    parser.add_argument("--model", default=MODEL)
+    parser.add_argument("--url", default=OLLAMA_URL)
+    parser.add_argument("--persona", help="persona text file (default: $AI_PET_PERSONA or built-in)")
+    parser.add_argument("--turns", type=int, default=len(USER_TURNS))
+    parser.add_argument("--num-predict", type=int, default=16, help="tokens generated per turn")
+    parser.add_argument("--modes", default="cold,stateless,session")
+    args = parser.parse_args()
+
+    persona = load_persona(PERSONA, args.persona)
+    turns = (USER_TURNS * (args.turns // len(USER_TURNS) + 1))[:args.turns]
+
+    # load the model once so the first measured turn is not a cold start for every mode
+    for _ in LLMStream("", model=args.model, url=args.url, fallback=False, keep_alive=KEEP_ALIVE):
+        pass
+
+    summary = {}
+    for mode in args.modes.split(","):
+        print(f"\n== {mode}")
+        print(f"{'turn':>4}{'prompt tok':>12}{'prefill ms':>12}{'load ms':>10}{'1st token ms':>14}")
+        results = bench(mode, persona, turns, args.model, args.url, args.num_predict)
+        for i, r in enumerate(results, 1):
+            print(f"{i:>4}{r['prompt_tokens']:>12}{r['prefill_ms']:>12.1f}{r['load_ms']:>10.1f}{r['first_token_ms']:>14.1f}")
+        later = results[1:] or results
+        summary[mode] = (
+            sum(r["prompt_tokens"] for r in later) / len(later),
+            sum(r["prefill_ms"] for r in later) / len(later),
+            sum(r["first_token_ms"] for r in later) / len(later),
+        )
+
+    print("\nmean over turns 2..n")
+    print(f"{'mode':<12}{'prompt tok':>12}{'prefill ms':>12}{'1st token ms':>14}")
+    for mode, (tokens, prefill, first) in summary.items():
+        print(f"{mode:<12}{tokens:>12.0f}{prefill:>12.1f}{first:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
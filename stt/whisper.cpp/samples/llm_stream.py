@@ -0,0 +1,177 @@
+"""Streaming LLM client for the local ollama HTTP API.
+
+Tokens are yielded as they arrive from POST /api/generate (newline-delimited
+JSON), so the voice loop can speak the first sentence while the rest of the
+reply is still being generated. Any local server speaking the same wire format
+works; if none is reachable it falls back to streaming `ollama run` stdout.
+
+LLMSession keeps one conversation with the model: the persona goes in as the
+system prompt on the first turn only, and every later turn sends back the
+`context` ollama returned, so the server finds the persona (and the earlier
+turns) already in its KV cache and only prefills the new user turn.
+keep_alive stops the model and that cache from being unloaded between turns.
+"""
+
+import codecs
+import json
+import subprocess
+import urllib.error
+import urllib.request
+
+from sentences import SentenceSplitter
+
+MODEL = "gemma3:270m"
+OLLAMA_URL = "http://127.0.0.1:11434"
+KEEP_ALIVE = "30m"
+
+
+class LLMStream:
+    """Iterate to get tokens; .sentences() groups them into speakable sentences.
+
+    After iteration, .final holds ollama's closing message (done_reason,
+    context, prompt_eval_count, eval_duration, ...), or {} for the CLI fallback.
+    """
+
+    def __init__(self, prompt, model=MODEL, url=OLLAMA_URL, timeout=120.0, fallback=True, cli_prompt=None, **fields):
+        self.prompt = prompt
+        self.cli_prompt = cli_prompt or prompt
+        self.model = model
+        self.url = url
+        self.timeout = timeout
+        self.fallback = fallback
+        self.fields = fields
+        self.final = None
+
+    def __iter__(self):
+        try:
+            resp = self._open()
+        except (urllib.error.URLError, ConnectionError) as e:
+            if not self.fallback:
+                raise
+            print(f"⚠️ ollama API unavailable ({e}), using ollama run")
+            yield from self._cli_tokens()
+            return
+
+        with resp:
+            for line in resp:
+                if not line.strip():
+                    continue
+                msg = json.loads(line)
+                if "error" in msg:
+                    raise RuntimeError(msg["error"])
+                if msg.get("response"):
+                    yield msg["response"]
+                if msg.get("done"):
+                    self.final = msg
+                    break
+
+    def sentences(self, min_chars=2):
+        splitter = SentenceSplitter(min_chars)
+        for token in self:
+            yield from splitter.feed(token)
+        yield from splitter.flush()
+
+    def _open(self):
+        body = {"model": self.model, "prompt": self.prompt, "stream": True}
+        body.update(self.fields)
+        req = urllib.request.Request(
+            self.url + "/api/generate",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        return urllib.request.urlopen(req, timeout=self.timeout)
+
+    def _cli_tokens(self):
+        proc = subprocess.Popen(
+            ["ollama", "run", self.model],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        proc.stdin.write(self.cli_prompt.encode("utf-8"))
+        proc.stdin.close()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            chunk = proc.stdout.read1(256)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        proc.wait()
+        self.final = {}
+
+
+class LLMSession:
+    """Multi-turn conversation that reuses the persona prefix across turns.
+
+    When the returned context grows past max_context tokens the session starts
+    over, so the persona is prefilled again once and the model's context
+    window never overflows. With remember=False every turn sends the persona
+    again and relies on the server matching the unchanged prompt prefix
+    against its cache; earlier turns are forgotten.
+    """
+
+    def __init__(self, persona, model=MODEL, url=OLLAMA_URL, keep_alive=KEEP_ALIVE, max_context=1536,
+                 remember=True, timeout=120.0, **fields):
+        self.persona = persona
+        self.model = model
+        self.url = url
+        self.keep_alive = keep_alive
+        self.max_context = max_context
+        self.remember = remember
+        self.timeout = timeout
+        self.fields = fields
+        self.context = None
+        self.last = {}          # closing message of the latest turn (prompt_eval_count, ...)
+
+    def reset(self):
+        self.context = None
+
+    def warm(self):
+        """Load the model and prefill the persona before the first turn."""
+        stream = LLMStream("", model=self.model, url=self.url, timeout=self.timeout, fallback=False,
+                           system=self.persona, keep_alive=self.keep_alive, options={"num_predict": 1})
+        for _ in stream:
+            pass
+
+    def stream(self, user_text):
+        self.last = {}
+        fields = dict(self.fields, keep_alive=self.keep_alive)
+        if self.context:
+            fields["context"] = self.context
+        else:
+            fields["system"] = self.persona
+        return _SessionStream(self, user_text, fields)
+
+    def sentences(self, user_text, min_chars=2):
+        return self.stream(user_text).sentences(min_chars)
+
+    def _finished(self, final):
+        self.last = final or {}
+        context = self.last.get("context")
+        if not context or len(context) > self.max_context:
+            self.context = None
+        elif self.remember:
+            self.context = context
+
+
+class _SessionStream(LLMStream):
+    def __init__(self, session, user_text, fields):
+        super().__init__(
+            user_text,
+            model=session.model,
+            url=session.url,
+            timeout=session.timeout,
+            cli_prompt=f"{session.persona}\n\nUser: {user_text}\nLLM Ai:",
+            **fields,
+        )
+        self.session = session
+
+    def __iter__(self):
+        yield from super().__iter__()
+        self.session._finished(self.final)
+
+
+def stream_sentences(prompt, model=MODEL, **kwargs):
+    return LLMStream(prompt, model=model, **kwargs).sentences()
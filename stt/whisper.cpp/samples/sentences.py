@@ -0,0 +1,42 @@
+"""Sentence splitting for speech: whole-text and incremental (token stream) variants."""
+
+import re
+
+# terminator run (plus closing quotes/brackets) followed by whitespace;
+# "~" counts because the persona ends phrases with "Purr~"
+SENTENCE_END = re.compile(r"[.!?~。！？]+[\"')\]]*(?=\s)|\n+")
+
+
+def split_sentences(text):
+    splitter = SentenceSplitter()
+    return splitter.feed(text) + splitter.flush()
+
+
+class SentenceSplitter:
+    """Accumulates streamed tokens and returns sentences as soon as they are complete.
+
+    A terminator only counts once the following whitespace has arrived, so
+    "3.5" or a token boundary inside "..." never splits early. Fragments shorter
+    than min_chars are held back and joined to the next sentence.
+    """
+
+    def __init__(self, min_chars=2):
+        self.min_chars = min_chars
+        self.buf = ""
+
+    def feed(self, token):
+        self.buf += token
+        out = []
+        start = 0
+        for m in SENTENCE_END.finditer(self.buf):
+            sentence = self.buf[start:m.end()].strip()
+            if len(sentence) >= self.min_chars:
+                out.append(sentence)
+                start = m.end()
+        self.buf = self.buf[start:]
+        return out
+
+    def flush(self):
+        rest = self.buf.strip()
+        self.buf = ""
+        return [rest] if rest else []
@@ -0,0 +1,296 @@
+"""Compiled sprite files: the character GIFs, pre-decoded and delta-encoded.
+
+    python3 sprites.py characters/*.gif --panel 160x128      # writes characters/<name>.sprite
+
+A .sprite file holds one or more tracks of the same animation:
+
+    rgba     full size RGBA, for the Tk windows
+    rgb565   resized to a panel, big-endian RGB565 ready for ShowRGB565
+
+Each track stores its pixels as palette indices (u8 when the track has at most
+256 colours, the GIF case) or as raw u16 RGB565 values. Every frame is the
+XOR with the previous one (a keyframe is the XOR with an all-zero frame),
+coded as (zero run, literal run) pairs followed by the literal elements;
+unchanged pixels cost nothing and decoding is a few numpy operations.
+
+Layout (little-endian, offsets from the start of the file):
+
+    magic "AIPETSP1" | track count u32
+    per track:  kind 8s | width u32 | height u32 | frames u32 | element size u32
+                | palette entries u32 | palette offset u64 | frame table offset u64
+    frame table per frame:  duration ms u32 | keyframe u32 | offset u64 | length u64
+    frame record:  runs u32 | zero runs u32[runs] | literal runs u32[runs] | literals
+
+Sprite(path) maps the whole file once; track data is read straight from the
+mapping, so only the current frame of each track is held in memory.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from frame_bank import decode_gif, to_rgb565
+
+MAGIC = b"AIPETSP1"
+FILE_HEADER = struct.Struct("<8sI")
+TRACK_HEADER = struct.Struct("<8sIIIIIQQ")
+FRAME_ENTRY = struct.Struct("<IIQQ")
+RUNS = struct.Struct("<I")
+
+RGBA = b"rgba"
+RGB565 = b"rgb565"
+
+# a literal run costs 8 bytes of run table, so shorter unchanged gaps are sent as literals
+RUN_COST = 8
+
+
+def sprite_path(gif_path):
+    return os.path.splitext(gif_path)[0] + ".sprite"
+
+
+def find_sprite(gif_path):
+    """The compiled sprite next to gif_path, if it exists and is not older than the GIF."""
+    path = sprite_path(gif_path)
+    try:
+        if os.path.getmtime(path) >= os.path.getmtime(gif_path):
+            return path
+    except OSError:
+        pass
+    return None
+
+
+# --- encoding -----------------------------------------------------------------
+
+def encode_frame(prev, cur):
+    """XOR of two flat frames as a record: run table plus the changed elements."""
+    x = np.bitwise_xor(prev, cur)
+    changed = np.concatenate(([False], x != 0, [False])).view(np.int8)
+    edges = np.diff(changed)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) > 1:
+        # merge literal runs separated by gaps cheaper to send than a new run
+        join = (starts[1:] - ends[:-1]) * x.itemsize < RUN_COST
+        starts = starts[np.concatenate(([True], ~join))]
+        ends = ends[np.concatenate((~join, [True]))]
+    lits = ends - starts
+    zeros = starts - np.concatenate(([0], ends[:-1]))
+    index = np.repeat(starts - (np.cumsum(lits) - lits), lits) + np.arange(int(lits.sum()))
+    return b"".join((
+        RUNS.pack(len(starts)),
+        zeros.astype("<u4").tobytes(),
+        lits.astype("<u4").tobytes(),
+        x[index].astype(x.dtype.newbyteorder("<")).tobytes(),
+    ))
+
+
+def quantize(frames, max_palette=256):
+    """Frames of N-byte pixels -> (palette, flat index frames); palette is None if too many colours."""
+    flat = [np.ascontiguousarray(f).reshape(-1, f.shape[-1] if f.ndim == 3 else 1) for f in frames]
+    width = flat[0].shape[1] * flat[0].itemsize
+    keys = [f.view(f"V{width}").reshape(-1) for f in flat]
+    palette, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    if len(palette) > max_palette:
+        return None, None
+    inverse = inverse.astype(np.uint8)
+    out = []
+    offset = 0
+    for k in keys:
+        out.append(inverse[offset:offset + len(k)])
+        offset += len(k)
+    return palette.view(flat[0].dtype).reshape(len(palette), -1), out
+
+
+def build_track(kind, frames, durations, width, height):
+    """(header fields, palette bytes, frame records) for one track."""
+    if kind == RGBA:
+        palette, elements = quantize(frames)
+        if palette is None:
+            raise ValueError("more than 256 RGBA colours; quantize the GIF first")
+        palette_bytes = palette.astype(np.uint8).tobytes()
+    else:
+        palette, elements = quantize(frames)
+        if palette is None:
+            elements = [f.astype("<u2").reshape(-1) for f in frames]
+            palette_bytes = b""
+        else:
+            palette_bytes = palette.reshape(-1).astype(">u2").tobytes()
+    elements = [e.reshape(-1) for e in elements]
+    prev = np.zeros_like(elements[0])
+    records = []
+    for i, cur in enumerate(elements):
+        records.append((durations[i], i == 0, encode_frame(prev, cur)))
+        prev = cur
+    entries = 0 if palette is None else len(palette)
+    return (kind, width, height, len(elements), elements[0].itemsize, entries), palette_bytes, records
+
+
+def compile_gif(gif_path, panels=(), out_path=None, rgba=True):
+    """Compile a GIF into a .sprite with an rgba track and one rgb565 track per (width, height)."""
+    tracks = []
+    if rgba:
+        with Image.open(gif_path) as im:
+            frames = []
+            durations = []
+            for frame in ImageSequence.Iterator(im):
+                frames.append(np.asarray(frame.convert("RGBA")))
+                durations.append(max(1, int(frame.info.get("duration", 100) or 100)))
+        h, w = frames[0].shape[:2]
+        tracks.append(build_track(RGBA, frames, durations, w, h))
+    for width, height in panels:
+        decoded = list(decode_gif(gif_path, width, height))
+        frames = [to_rgb565(rgb).astype(np.uint16) for rgb, _ in decoded]
+        tracks.append(build_track(RGB565, frames, [d for _, d in decoded], width, height))
+
+    out_path = out_path or sprite_path(gif_path)
+    offset = FILE_HEADER.size + TRACK_HEADER.size * len(tracks)
+    headers = []
+    body = []
+    for (kind, width, height, count, itemsize, entries), palette_bytes, records in tracks:
+        palette_offset = offset
+        offset += len(palette_bytes)
+        table_offset = offset
+        offset += FRAME_ENTRY.size * count
+        table = []
+        for duration, key, record in records:
+            table.append(FRAME_ENTRY.pack(duration, key, offset, len(record)))
+            offset += len(record)
+        headers.append(TRACK_HEADER.pack(kind, width, height, count, itemsize, entries, palette_offset, table_offset))
+        body += [palette_bytes] + table + [record for _, _, record in records]
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(FILE_HEADER.pack(MAGIC, len(tracks)))
+        for h in headers:
+            f.write(h)
+        for chunk in body:
+            f.write(chunk)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+# --- decoding -----------------------------------------------------------------
+
+class Track:
+    """One animation track; frames decode sequentially from the mapped file."""
+
+    def __init__(self, buf, header):
+        kind, width, height, count, itemsize, entries, palette_offset, table_offset = header
+        self.buf = buf
+        self.kind = kind.rstrip(b"\0")
+        self.width = width
+        self.height = height
+        self.dtype = np.dtype("<u1" if itemsize == 1 else "<u2")
+        table = np.frombuffer(buf, dtype=[("duration", "<u4"), ("key", "<u4"), ("offset", "<u8"), ("length", "<u8")],
+                              count=count, offset=table_offset)
+        self.durations = (table["duration"] / 1000.0).tolist()
+        self.keys = table["key"].astype(bool)
+        self.offsets = table["offset"].tolist()
+        self.palette = None
+        if entries:
+            if self.kind == RGBA:
+                self.palette = np.frombuffer(buf, dtype=np.uint8, count=entries * 4, offset=palette_offset).reshape(entries, 4)
+            else:
+                self.palette = np.frombuffer(buf, dtype=">u2", count=entries, offset=palette_offset)
+        self.state = np.zeros(width * height, dtype=self.dtype)
+        self.position = -1          # index of the frame held in state
+
+    def __len__(self):
+        return len(self.durations)
+
+    def _apply(self, index):
+        offset = self.offsets[index]
+        runs = RUNS.unpack_from(self.buf, offset)[0]
+        offset += RUNS.size
+        zeros = np.frombuffer(self.buf, dtype="<u4", count=runs, offset=offset).astype(np.int64)
+        lits = np.frombuffer(self.buf, dtype="<u4", count=runs, offset=offset + 4 * runs).astype(np.int64)
+        total = int(lits.sum())
+        values = np.frombuffer(self.buf, dtype=self.dtype, count=total, offset=offset + 8 * runs)
+        if self.keys[index]:
+            self.state[:] = 0
+        if total:
+            starts = np.cumsum(zeros) + np.cumsum(lits) - lits
+            pos = np.repeat(starts - (np.cumsum(lits) - lits), lits) + np.arange(total)
+            self.state[pos] ^= values
+
+    def _seek(self, index):
+        if index == self.position:
+            return
+        if index < self.position or self.position < 0:
+            start = index
+            while not self.keys[start]:
+                start -= 1
+            self.position = start - 1
+        for i in range(self.position + 1, index + 1):
+            self._apply(i)
+        self.position = index
+
+    def pixels(self, index, out=None):
+        """Frame index as HxWx4 RGBA (rgba track) or flat big-endian RGB565 bytes (rgb565 track).
+
+        The result is a new array unless out is given.
+        """
+        self._seek(index % len(self))
+        if self.palette is not None:
+            out = np.take(self.palette, self.state, axis=0, out=out)
+        elif out is not None:
+            out[...] = self.state
+        else:
+            out = self.state.astype(">u2")
+        if self.kind == RGBA:
+            return out.reshape(self.height, self.width, 4)
+        return out.view(np.uint8).reshape(-1)
+
+    __getitem__ = pixels
+
+    def image(self, index):
+        """Frame index of an rgba track as a PIL image."""
+        return Image.fromarray(self.pixels(index), "RGBA")
+
+
+class Sprite:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = FILE_HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"not a sprite file: {path}")
+        self.tracks = [
+            Track(self.buf, TRACK_HEADER.unpack_from(self.buf, FILE_HEADER.size + i * TRACK_HEADER.size))
+            for i in range(count)
+        ]
+
+    def track(self, kind, width=None, height=None):
+        """The track of that kind (and panel size), or None."""
+        kind = kind.encode() if isinstance(kind, str) else kind
+        for t in self.tracks:
+            if t.kind == kind and width in (None, t.width) and height in (None, t.height):
+                return t
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile character GIFs into delta-encoded .sprite files")
+    parser.add_argument("gifs", nargs="+")
+    parser.add_argument("--panel", action="append", default=[], metavar="WxH",
+                        help="add an RGB565 track for this panel size (repeatable), e.g. 160x128")
+    parser.add_argument("--no-rgba", action="store_true", help="skip the full-size RGBA track")
+    args = parser.parse_args()
+    panels = [tuple(int(v) for v in p.lower().split("x")) for p in args.panel]
+
+    for gif in args.gifs:
+        try:
+            out = compile_gif(gif, panels, rgba=not args.no_rgba)
+        except (OSError, ValueError) as e:
+            print(f"❌ {gif}: {e}")
+            continue
+        print(f"🎞 {gif} ({os.path.getsize(gif)} B) -> {out} ({os.path.getsize(out)} B)")
+
+
+if __name__ == "__main__":
+    main()
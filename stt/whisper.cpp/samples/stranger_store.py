@@ -0,0 +1,167 @@
+"""Background writer for stranger snapshots.
+
+face_r.py hands over the face crop and returns at once; a worker thread does
+the filtering and the SD-card I/O:
+
+    - near-duplicates are skipped: a 64-bit difference hash of the crop is
+      compared with the hashes of the last few saved snapshots
+    - at most per_minute snapshots are written in any 60 s window
+    - the store's own snapshots (SNAPSHOT_PREFIX*) are kept under max_bytes
+      by deleting the oldest; other files in the folder are never counted or
+      removed, so the existing stranger/ corpus used by face_detect_bench.py
+      stays intact
+
+    store = StrangerStore("stranger", on_saved=lambda path: bus.publish(STRANGER_SEEN, path=path)).start()
+    store.submit(crop_face(frame, box))
+
+on_saved runs on the worker thread, once per snapshot actually written.
+"""
+
+import collections
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+SNAPSHOT_PREFIX = "face_"     # names this store writes: face_<epoch ms>_<dhash>.jpg
+
+
+def dhash(image):
+    """64-bit difference hash: brighter-than-right-neighbour bits of a 9x8 thumbnail."""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def crop_face(frame, box, margin=0.25):
+    """The face box grown by margin on every side, clipped to the frame."""
+    x, y, w, h = box[:4]
+    dx, dy = int(w * margin), int(h * margin)
+    height, width = frame.shape[:2]
+    return frame[max(0, y - dy):min(height, y + h + dy), max(0, x - dx):min(width, x + w + dx)]
+
+
+class StrangerStore:
+    def __init__(self, directory="stranger", per_minute=6, max_bytes=20 * 1024 * 1024, max_distance=10,
+                 recent=32, max_pending=8, on_saved=None):
+        self.directory = directory
+        self.per_minute = per_minute
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance        # Hamming distance at or below which a crop is a duplicate
+        self.on_saved = on_saved
+        self.pending = queue.Queue(max_pending)
+        self.recent = collections.deque(maxlen=recent)  # hashes of the last saved snapshots
+        self.writes = collections.deque()       # monotonic times of writes in the last minute
+        self.files = []                         # (mtime, size, path), oldest first
+        self.total_bytes = 0
+        self.thread = None
+        self.counts = collections.Counter()     # saved / duplicate / rate_limited / dropped / evicted
+
+    def start(self):
+        if self.thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.thread = threading.Thread(target=self._run, name="stranger-store", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def submit(self, face):
+        """Queue a BGR face crop; False if the writer is behind and the crop was dropped."""
+        if face is None or face.size == 0:
+            return False
+        try:
+            self.pending.put_nowait(face.copy())
+            return True
+        except queue.Full:
+            self.counts["dropped"] += 1
+            return False
+
+    def stats(self):
+        return dict(self.counts, files=len(self.files), bytes=self.total_bytes)
+
+    def _scan(self):
+        """Snapshots this store wrote before: sizes for the cap, hashes of the newest ones for deduplication."""
+        files = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".jpg"):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        files.sort()
+        self.files = files
+        self.total_bytes = sum(size for _, size, _ in files)
+        for _, _, path in files[-self.recent.maxlen:]:
+            img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if img is not None:
+                self.recent.append(dhash(img))
+        self._evict()
+
+    def _evict(self):
+        while self.files and self.total_bytes > self.max_bytes:
+            _, size, path = self.files.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.total_bytes -= size
+            self.counts["evicted"] += 1
+
+    def _save(self, face):
+        h = dhash(face)
+        if any(hamming(h, seen) <= self.max_distance for seen in self.recent):
+            self.counts["duplicate"] += 1
+            return None
+        now = time.monotonic()
+        while self.writes and now - self.writes[0] >= 60.0:
+            self.writes.popleft()
+        if len(self.writes) >= self.per_minute:
+            self.counts["rate_limited"] += 1
+            return None
+        path = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{int(time.time() * 1000)}_{h:016x}.jpg")
+        if not cv2.imwrite(path, face):
+            print(f"❌ Cannot write {path}")
+            return None
+        size = os.path.getsize(path)
+        self.writes.append(now)
+        self.recent.append(h)
+        self.files.append((time.time(), size, path))
+        self.total_bytes += size
+        self.counts["saved"] += 1
+        self._evict()
+        return path
+
+    def _run(self):
+        try:
+            self._scan()
+        except OSError as e:
+            print(f"⚠️ Cannot scan {self.directory}: {e}")
+        while True:
+            face = self.pending.get()
+            if face is None:
+                return
+            try:
+                path = self._save(face)
+            except (OSError, cv2.error) as e:
+                print(f"❌ Stranger snapshot failed: {e}")
+                continue
+            if path and self.on_saved:
+                try:
+                    self.on_saved(path)
+                except Exception as e:
+                    print(f"⚠️ Stranger snapshot callback failed: {e}")
@@ -0,0 +1,119 @@
+"""Client side of the resident STT daemon (see stt_daemon.py).
+
+Wire protocol, one request per connection over a Unix socket:
+
+    client -> daemon   one JSON header line, e.g. {"n_bytes": 32000, "sample_rate": 16000}
+                       followed by exactly n_bytes of mono S16_LE PCM
+    daemon -> client   one JSON line: {"text": "...", "segments": [{"start", "end", "text"}, ...]}
+                       or {"error": "..."}
+
+Optional header keys ("language", "prompt", "audio_ctx") are forwarded to whisper.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import wave
+
+WHISPER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+WHISPER_CLI = os.path.join(WHISPER_DIR, "build", "bin", "whisper-cli")
+MODEL_PATH = os.path.join(WHISPER_DIR, "models", "ggml-tiny.bin")
+
+SOCKET_PATH = "/tmp/ai-pet-stt.sock"
+SAMPLE_RATE = 16000
+
+
+class STTError(Exception):
+    pass
+
+
+def send_message(sock, header, payload=b""):
+    sock.sendall(json.dumps(header).encode("utf-8") + b"\n")
+    if payload:
+        sock.sendall(payload)
+
+
+def read_line(sock_file):
+    line = sock_file.readline()
+    if not line:
+        raise STTError("connection closed")
+    return json.loads(line.decode("utf-8"))
+
+
+def transcribe_pcm(pcm, sample_rate=SAMPLE_RATE, socket_path=SOCKET_PATH, timeout=30.0, **options):
+    """Send raw S16_LE PCM to the daemon, return {"text": ..., "segments": [...]}."""
+    header = {"n_bytes": len(pcm), "sample_rate": sample_rate}
+    header.update({k: v for k, v in options.items() if v is not None})
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        send_message(sock, header, pcm)
+        with sock.makefile("rb") as f:
+            result = read_line(f)
+
+    if "error" in result:
+        raise STTError(result["error"])
+    return result
+
+
+def read_wav_pcm(wav_file):
+    with wave.open(wav_file, "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise STTError(f"{wav_file}: expected mono 16-bit PCM")
+        return wf.readframes(wf.getnframes()), wf.getframerate()
+
+
+def write_wav(wav_file, pcm, sample_rate=SAMPLE_RATE):
+    with wave.open(wav_file, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+
+
+def run_stt_cli(wav_file, model=MODEL_PATH, language="en"):
+    """Per-turn fallback: spawn whisper-cli (reloads the model every call)."""
+    txt_file = wav_file + ".txt"
+    if os.path.exists(txt_file):
+        os.remove(txt_file)
+
+    subprocess.run([
+        WHISPER_CLI,
+        "-m", model,
+        "-f", wav_file,
+        "-otxt",
+        "-nt",
+        "-p", "1",
+        "-l", language
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    if not os.path.exists(txt_file):
+        return ""
+    with open(txt_file, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def transcribe(pcm, wav_file, sample_rate=SAMPLE_RATE, socket_path=SOCKET_PATH, fallback=True, **options):
+    """Transcribe in-memory PCM through the daemon; if it is not running, save to wav_file and use whisper-cli."""
+    try:
+        return transcribe_pcm(pcm, sample_rate=sample_rate, socket_path=socket_path, **options)["text"].strip()
+    except (OSError, STTError) as e:
+        if not fallback:
+            raise
+        print(f"⚠️ STT daemon unavailable ({e}), using whisper-cli")
+        write_wav(wav_file, pcm, sample_rate)
+        return run_stt_cli(wav_file, language=options.get("language") or "en")
+
+
+def transcribe_file(wav_file, socket_path=SOCKET_PATH, fallback=True, **options):
+    """Transcribe a WAV file through the daemon, falling back to whisper-cli if it is not running."""
+    try:
+        pcm, rate = read_wav_pcm(wav_file)
+        return transcribe_pcm(pcm, sample_rate=rate, socket_path=socket_path, **options)["text"].strip()
+    except (OSError, wave.Error, STTError) as e:
+        if not fallback:
+            raise
+        print(f"⚠️ STT daemon unavailable ({e}), using whisper-cli")
+        return run_stt_cli(wav_file, language=options.get("language") or "en")
@@ -0,0 +1,176 @@
+"""Resident speech-to-text daemon.
+
+Starts one whisper-server child with the model loaded once, and serves
+transcription requests from the voice loop over a Unix socket, so a turn
+no longer pays process startup + model load. Protocol: see stt_client.py.
+
+    python3 stt_daemon.py -m ../models/ggml-tiny.bin -t 4
+"""
+
+import argparse
+import io
+import json
+import os
+import signal
+import socketserver
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from stt_client import MODEL_PATH, SAMPLE_RATE, SOCKET_PATH, WHISPER_DIR, send_message, write_wav
+
+SERVER_BIN = os.path.join(WHISPER_DIR, "build", "bin", "whisper-server")
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8178
+
+FORWARDED_OPTIONS = ("language", "prompt", "audio_ctx")
+
+
+def pcm_to_wav(pcm, sample_rate=SAMPLE_RATE):
+    buf = io.BytesIO()
+    write_wav(buf, pcm, sample_rate)
+    return buf.getvalue()
+
+
+def encode_multipart(fields, file_field, file_name, file_data):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f"--{boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"{name}\"\r\n\r\n"
+            f"{value}\r\n".encode("utf-8")
+        )
+    parts.append(
+        f"--{boundary}\r\n"
+        f"Content-Disposition: form-data; name=\"{file_field}\"; filename=\"{file_name}\"\r\n"
+        f"Content-Type: audio/wav\r\n\r\n".encode("utf-8")
+    )
+    parts.append(file_data)
+    parts.append(f"\r\n--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class WhisperServer:
+    """whisper-server child process that keeps the model resident."""
+
+    def __init__(self, model=MODEL_PATH, threads=4, language="en", host=SERVER_HOST, port=SERVER_PORT, server_bin=SERVER_BIN):
+        self.model = model
+        self.threads = threads
+        self.language = language
+        self.url = f"http://{host}:{port}"
+        self.cmd = [
+            server_bin,
+            "-m", model,
+            "-t", str(threads),
+            "-l", language,
+            "-nlp",
+            "--host", host,
+            "--port", str(port),
+        ]
+        self.proc = None
+
+    def start(self, timeout=60.0):
+        self.proc = subprocess.Popen(self.cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"whisper-server exited with code {self.proc.returncode}")
+            try:
+                urllib.request.urlopen(self.url + "/", timeout=1.0).close()
+                return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("whisper-server did not become ready")
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.proc = None
+
+    def transcribe(self, pcm, sample_rate=SAMPLE_RATE, **options):
+        fields = {"response_format": "verbose_json", "temperature": "0.0", "language": self.language}
+        fields.update({k: v for k, v in options.items() if v is not None})
+        body, content_type = encode_multipart(fields, "file", "turn.wav", pcm_to_wav(pcm, sample_rate))
+
+        req = urllib.request.Request(self.url + "/inference", data=body, headers={"Content-Type": content_type})
+        with urllib.request.urlopen(req, timeout=60.0) as resp:
+            result = json.loads(resp.read().decode("utf-8"))
+
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        segments = [
+            {"start": s.get("start"), "end": s.get("end"), "text": s.get("text", "").strip()}
+            for s in result.get("segments", [])
+        ]
+        return {"text": result.get("text", "").strip(), "segments": segments}
+
+
+class STTRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        t0 = time.monotonic()
+        try:
+            header = json.loads(self.rfile.readline().decode("utf-8"))
+            n_bytes = int(header["n_bytes"])
+            sample_rate = int(header.get("sample_rate", SAMPLE_RATE))
+            if sample_rate != SAMPLE_RATE:
+                raise ValueError(f"expected {SAMPLE_RATE} Hz PCM, got {sample_rate}")
+            pcm = self.rfile.read(n_bytes)
+            if len(pcm) != n_bytes:
+                raise ValueError("short PCM payload")
+            options = {k: header[k] for k in FORWARDED_OPTIONS if k in header}
+            result = self.server.whisper.transcribe(pcm, sample_rate, **options)
+            result["elapsed"] = round(time.monotonic() - t0, 3)
+        except Exception as e:
+            result = {"error": str(e)}
+        send_message(self.connection, result)
+
+
+class STTDaemon(socketserver.UnixStreamServer):
+    def __init__(self, socket_path, whisper):
+        self.whisper = whisper
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, STTRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident whisper STT daemon")
+    parser.add_argument("-m", "--model", default=MODEL_PATH)
+    parser.add_argument("-t", "--threads", type=int, default=4)
+    parser.add_argument("-l", "--language", default="en")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+
+    whisper = WhisperServer(args.model, args.threads, args.language, port=args.port)
+    print(f"⏳ Loading {args.model} ...")
+    whisper.start()
+
+    daemon = STTDaemon(args.socket, whisper)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"👂 STT daemon listening on {args.socket}")
+    try:
+        daemon.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        daemon.server_close()
+        whisper.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,27 @@
-import subprocess
 import time
 import os
+from stt_client import transcribe
+from vad_capture import VADCapture
+from tts_stream import PiperStream
 
 MODEL = "gemma3:270m"
 WAV_FILE = "test16k.wav"
-TXT_FILE = "test16k.wav.txt"
 
 PIPER_BIN = "/home/charles/ai-pet/stt/whisper.cpp/piper/piper"
 PIPER_MODEL = "/home/charles/ai-pet/stt/whisper.cpp/piper/models/en_US-lessac-medium.onnx"
-PIPER_OUT = "/home/charles/ai-pet/stt/whisper.cpp/piper/tts.wav"
+
+
+capture = VADCapture(device="hw:2,0", silence_ms=500)
 
 
 def record_audio():
-    subprocess.run([
-        "arecord",
-        "-D", "hw:2,0",
-        "-f", "S16_LE",
-        "-r", "16000",
-        "-c", "1",
-        "-d", "5",
-        WAV_FILE
-    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # returns as soon as the speaker stops, instead of a fixed 5 s window
+    return capture.record_utterance().pcm
 
 
-def run_stt():
-    subprocess.run([
-        "/home/charles/ai-pet/stt/whisper.cpp/build/bin/whisper-cli",
-        "-m", "../models/ggml-tiny.bin",
-        "-f", WAV_FILE,
-        "-otxt",
-        "-nt",
-        "-p", "1",
-        "-l","en"
-    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+def run_stt(pcm):
+    # resident stt_daemon.py if running, else a one-shot whisper-cli on WAV_FILE
+    return transcribe(pcm, WAV_FILE, language="en")
 
 
 def clean_text(text, max_words=100):
@@ -40,30 +29,15 @@ def clean_text(text, max_words=100):
     return " ".join(text.split()[:max_words])
 
 
-def speak(text):
+tts = PiperStream(PIPER_MODEL, piper_bin=PIPER_BIN)
+
+
+def speak(text, wait=True):
     text = clean_text(text)
     if not text:
         return
 
-    p = subprocess.Popen(
-        [
-            PIPER_BIN,
-            "--model", PIPER_MODEL,
-            "--output_file", PIPER_OUT
-        ],
-        stdin=subprocess.PIPE,
-        text=True
-    )
-
-    p.communicate(text)
-
-    #subprocess.run(["aplay", "-D", "plughw:0,0", PIPER_OUT],
-                   #stdout=subprocess.DEVNULL,
-                   #stderr=subprocess.DEVNULL)
-   
-    # 1️⃣ Create cartoon WAV
-    subprocess.run(
-        #f"sox {PIPER_OUT} -t wav - gain -n -7 pitch 150 speed 0.88 bass -2 treble +0 | pw-play plughw:0,0", shell=True
-        ["pw-play", PIPER_OUT], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-
-    )
\ No newline at end of file
+    # one resident piper in raw mode; the next sentence is synthesized while this one plays
+    tts.say(text)
+    if wait:
+        tts.wait()
@@ -0,0 +1,76 @@
+import os
+import stat
+import sys
+import textwrap
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tts_stream import PiperStream  # noqa: E402
+
+RATE = 22050
+
+# stands in for piper --output_raw: per input line, writes that line's samples
+# (every sample = its length, so slices are recognisable) plus the sentence
+# silence, then logs audio= for the speech part only, as piper does
+FAKE_PIPER = textwrap.dedent("""\
+    #!{python}
+    import sys, time
+    args = sys.argv[1:]
+    silence = float(args[args.index("--sentence_silence") + 1]) if "--sentence_silence" in args else 0.2
+    for line in sys.stdin:
+        time.sleep({delay})
+        n = len(line.strip()) * 1000
+        sys.stdout.buffer.write(bytes([len(line.strip())]) * (2 * n))
+        sys.stdout.buffer.write(bytes(2 * int(silence * {rate})))
+        sys.stdout.buffer.flush()
+        sys.stderr.write(f"[info] Real-time factor: 0.1 (infer=0.01 sec, audio={{n / {rate}}} sec)\\n")
+        sys.stderr.flush()
+""")
+
+
+def make_stream(tmp_path, delay=0.0):
+    piper = tmp_path / "piper"
+    piper.write_text(FAKE_PIPER.format(python=sys.executable, rate=RATE, delay=delay))
+    piper.chmod(piper.stat().st_mode | stat.S_IEXEC)
+    return PiperStream(model=str(tmp_path / "none.onnx"), piper_bin=str(piper), player_cmd=["cat"])
+
+
+def test_sentences_are_cut_on_their_own_boundaries(tmp_path):
+    stream = make_stream(tmp_path)
+    assert stream.sample_rate == RATE
+    stream.start()
+    try:
+        for sentence in ("Hello there.", "Hi."):
+            pcm = stream.synthesize(sentence)
+            assert len(pcm) == 2 * 1000 * len(sentence)
+            assert set(pcm) == {len(sentence)}
+    finally:
+        stream.close()
+
+
+def test_cancel_drops_the_sentence_inside_piper(tmp_path):
+    stream = make_stream(tmp_path, delay=0.3)
+    played = []
+    stream.add_listener(lambda event, **info: played.append(info["sentence"]) if event == "play" else None)
+    stream.say("First one. Second one.")
+    time.sleep(0.1)                 # first sentence is now inside piper
+    stream.cancel()
+    stream.say("After.")
+    stream.wait()
+    stream.close()
+    assert played == ["After."]
+
+
+def test_cancel_keeps_the_close_sentinel(tmp_path):
+    stream = make_stream(tmp_path, delay=0.3)
+    stream.say("One. Two. Three.")
+    time.sleep(0.1)
+    closer = threading.Thread(target=stream.close)
+    started = time.monotonic()
+    closer.start()
+    time.sleep(0.05)                # close() has queued its sentinel behind the sentences
+    stream.cancel()
+    closer.join()
+    assert time.monotonic() - started < 2
@@ -0,0 +1,56 @@
+import os
+import stat
+import sys
+import textwrap
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vad_capture import FRAME_SAMPLES, VADCapture  # noqa: E402
+
+# stands in for arecord: 0.5 s silence, 1 s loud tone, then silence until terminated
+FAKE_ARECORD = textwrap.dedent("""\
+    #!{python}
+    import sys, time
+    import numpy as np
+    out = sys.stdout.buffer
+    tone = (8000 * np.sin(np.arange(16000) * 0.3)).astype("<i2").tobytes()
+    out.write(bytes(16000) + tone)
+    while True:
+        out.write(bytes(3200))
+        out.flush()
+        time.sleep(0.01)
+""")
+
+
+class EnergyVAD:
+    """Speech probability 1.0 for loud frames, 0.0 otherwise."""
+
+    def probs(self, window):
+        frames = window[len(window) % FRAME_SAMPLES:].reshape(-1, FRAME_SAMPLES)
+        return (np.abs(frames).mean(axis=1) > 0.05).astype(np.float32)
+
+    def close(self):
+        pass
+
+
+def test_record_after_stop_and_restart(tmp_path, monkeypatch):
+    script = tmp_path / "arecord"
+    script.write_text(FAKE_ARECORD.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    capture = VADCapture(vad=EnergyVAD(), silence_ms=300)
+    try:
+        first = capture.record_utterance(timeout=5)
+        assert first is not None
+        capture.stop()
+        assert capture.proc is None
+
+        capture.start()
+        second = capture.record_utterance(timeout=5)
+        assert second is not None
+        assert len(second.pcm) >= 16000
+    finally:
+        capture.close()
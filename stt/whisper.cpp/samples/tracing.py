@@ -0,0 +1,166 @@
+"""Per-turn latency tracing for the voice loop.
+
+Every conversation turn collects spans (stage name + monotonic start/end) and
+is written as one JSON line to a size-rotated trace file. Run this module to
+summarize p50/p95/p99 per stage and end to end:
+
+    python3 tracing.py                      # default trace file + rotations
+    python3 tracing.py ~/turns.jsonl --last 200
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import logging
+import logging.handlers
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_FILE = os.path.expanduser("~/.cache/ai-pet/turns.jsonl")
+
+# pipeline order for the summary table; unknown stages are listed after these
+STAGE_ORDER = ["record", "wake", "stt", "llm_first_sentence", "llm", "tts", "playback", "display"]
+
+
+class Turn:
+    def __init__(self, tracer, turn_id):
+        self.tracer = tracer
+        self.id = turn_id
+        self.spans = []
+        self.lock = threading.Lock()
+
+    def record(self, stage, start, end, **attrs):
+        span = {"stage": stage, "start": round(start, 6), "end": round(end, 6), "ms": round((end - start) * 1000, 1)}
+        span.update(attrs)
+        with self.lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(stage, start, time.monotonic(), **attrs)
+
+    def finish(self, **attrs):
+        self.tracer.write(self, **attrs)
+
+
+class NullTurn:
+    id = None
+
+    def record(self, stage, start, end, **attrs):
+        pass
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        yield
+
+    def finish(self, **attrs):
+        pass
+
+
+class NullTracer:
+    """Tracing disabled."""
+
+    def new_turn(self):
+        return NullTurn()
+
+
+class Tracer:
+    def __init__(self, path=TRACE_FILE, max_bytes=2 * 1024 * 1024, backups=3):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.log = logging.getLogger(f"ai_pet.trace.{path}")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        if not self.log.handlers:
+            handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.log.addHandler(handler)
+        self.ids = itertools.count(1)
+        self.session = int(time.time())
+
+    def new_turn(self):
+        return Turn(self, next(self.ids))
+
+    def write(self, turn, **attrs):
+        with turn.lock:
+            spans = sorted(turn.spans, key=lambda s: s["start"])
+        if not spans:
+            return
+        line = {
+            "session": self.session,
+            "turn": turn.id,
+            "wall": round(time.time(), 3),
+            "total_ms": round((max(s["end"] for s in spans) - min(s["start"] for s in spans)) * 1000, 1),
+            "spans": spans,
+        }
+        line.update(attrs)
+        self.log.info(json.dumps(line, ensure_ascii=False))
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100.0 * len(ordered)) - 1)]
+
+
+def load_turns(paths):
+    turns = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        turns.append(json.loads(line))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ skipping {path}: {e}")
+    return sorted(turns, key=lambda t: t.get("wall", 0))
+
+
+def summarize(turns):
+    """Per-turn totals for each stage (several TTS spans in one turn are summed), then end to end."""
+    stages = {}
+    for turn in turns:
+        per_turn = {}
+        for span in turn["spans"]:
+            per_turn[span["stage"]] = per_turn.get(span["stage"], 0.0) + span["ms"]
+        for stage, ms in per_turn.items():
+            stages.setdefault(stage, []).append(ms)
+
+    ordered = {stage: stages.pop(stage) for stage in STAGE_ORDER if stage in stages}
+    ordered.update(sorted(stages.items()))
+    ordered["end-to-end (response)"] = [t["response_ms"] for t in turns if "response_ms" in t]
+    ordered["end-to-end (turn)"] = [t["total_ms"] for t in turns]
+    return {stage: values for stage, values in ordered.items() if values}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize voice loop turn traces")
+    parser.add_argument("files", nargs="*", help=f"trace files (default: {TRACE_FILE}*)")
+    parser.add_argument("--last", type=int, default=0, help="only the most recent N turns")
+    args = parser.parse_args()
+
+    paths = args.files or sorted(glob.glob(TRACE_FILE + "*"), reverse=True)
+    turns = load_turns(paths)
+    if args.last:
+        turns = turns[-args.last:]
+    if not turns:
+        print("No traced turns found")
+        return
+
+    print(f"{len(turns)} turns\n")
+    print(f"{'stage':<24}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, values in summarize(turns).items():
+        print(f"{stage:<24}{len(values):>6}{percentile(values, 50):>10.0f}{percentile(values, 95):>10.0f}"
+              f"{percentile(values, 99):>10.0f}{max(values):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Content-addressed cache of synthesized TTS audio.
+
+Entries are raw PCM keyed by a SHA-256 of the text, the voice model and the
+synthesis parameters (length_scale, noise_scale, noise_w, sample rate). The
+disk tier is a size-bounded LRU (least recently used file evicted first, by
+access order kept in memory and seeded from mtimes); a small in-memory hot
+set serves repeated phrases such as the greeting without touching the disk.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import threading
+
+CACHE_DIR = os.path.expanduser("~/.cache/ai-pet/tts")
+
+
+def cache_key(text, model, sample_rate, length_scale=None, noise_scale=None, noise_w=None, sentence_silence=None):
+    params = {
+        "text": " ".join(text.split()),
+        "model": os.path.basename(model),
+        "sample_rate": sample_rate,
+        "length_scale": length_scale,
+        "noise_scale": noise_scale,
+        "noise_w": noise_w,
+        "sentence_silence": sentence_silence,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=64 * 1024 * 1024, hot_bytes=4 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hot_bytes = hot_bytes
+        self.lock = threading.Lock()
+        self.hot = collections.OrderedDict()
+        self.hot_size = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".pcm"):
+                st = os.stat(os.path.join(cache_dir, name))
+                entries.append((st.st_mtime, name[:-4], st.st_size))
+        self.disk = collections.OrderedDict((key, size) for _, key, size in sorted(entries))
+        self.disk_size = sum(self.disk.values())
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".pcm")
+
+    def get(self, key):
+        with self.lock:
+            pcm = self.hot.get(key)
+            if pcm is not None:
+                self.hot.move_to_end(key)
+                if key in self.disk:
+                    self.disk.move_to_end(key)
+                self.hits += 1
+                return pcm
+            if key not in self.disk:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "rb") as f:
+                    pcm = f.read()
+                os.utime(self._path(key))
+            except OSError:
+                self._forget(key)
+                self.misses += 1
+                return None
+            self.disk.move_to_end(key)
+            self._remember(key, pcm)
+            self.hits += 1
+            return pcm
+
+    def put(self, key, pcm):
+        with self.lock:
+            path = self._path(key)
+            tmp = path + ".tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(pcm)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"⚠️ TTS cache write failed: {e}")
+                return
+            self.disk_size += len(pcm) - self.disk.get(key, 0)
+            self.disk[key] = len(pcm)
+            self.disk.move_to_end(key)
+            self._remember(key, pcm)
+            while self.disk_size > self.max_bytes and len(self.disk) > 1:
+                oldest = next(iter(self.disk))
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+                self._forget(oldest)
+
+    def _remember(self, key, pcm):
+        if len(pcm) > self.hot_bytes:
+            return
+        self.hot_size += len(pcm) - len(self.hot.get(key, b""))
+        self.hot[key] = pcm
+        self.hot.move_to_end(key)
+        while self.hot_size > self.hot_bytes:
+            _, old = self.hot.popitem(last=False)
+            self.hot_size -= len(old)
+
+    def _forget(self, key):
+        self.disk_size -= self.disk.pop(key, 0)
+        old = self.hot.pop(key, None)
+        if old is not None:
+            self.hot_size -= len(old)
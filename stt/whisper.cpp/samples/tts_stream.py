@@ -0,0 +1,253 @@
+"""Sentence-chunked, overlapped Piper synthesis and playback.
+
+One piper process runs for the whole session with --output_raw, and one raw
+PCM player (aplay) is fed from a bounded queue, so sentence N+1 is being
+synthesized while sentence N plays, without temp WAV files. With a TTSCache
+attached, sentences synthesized before are played straight from the cache and
+never reach piper.
+
+Listeners added with add_listener(fn) are called from the worker threads as
+fn("synth", sentence=, start=, end=, cached=) once a sentence's PCM is ready
+and fn("play", sentence=, pcm=, start=, duration=) when it is handed to the
+player (start is the estimated monotonic time it becomes audible).
+
+Piper logs "Real-time factor: ... audio=<seconds> sec" on stderr after each
+input line, once that line's PCM has been written to stdout; that is used to
+cut the raw stdout stream back into per-sentence buffers. piper runs with
+--sentence_silence 0 because the silence it appends after each sentence is
+written to stdout but not counted in audio=.
+"""
+
+import json
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+
+from sentences import split_sentences
+from tts_cache import cache_key
+
+WHISPER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PIPER_BIN = os.path.join(WHISPER_DIR, "piper", "piper")
+PIPER_MODEL = os.path.join(WHISPER_DIR, "piper", "models", "en_US-lessac-medium.onnx")
+
+PLAYER_CMD = ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", "{rate}"]
+
+RTF_LINE = re.compile(rb"Real-time factor:.*audio=([0-9.eE+-]+) sec")
+
+
+def piper_sample_rate(model, default=22050):
+    try:
+        with open(model + ".json", "r", encoding="utf-8") as f:
+            return int(json.load(f)["audio"]["sample_rate"])
+    except (OSError, KeyError, ValueError):
+        return default
+
+
+class PiperStream:
+    def __init__(
+        self,
+        model=PIPER_MODEL,
+        piper_bin=PIPER_BIN,
+        player_cmd=PLAYER_CMD,
+        max_pending=2,
+        length_scale=None,
+        noise_scale=None,
+        noise_w=None,
+        cache=None,
+    ):
+        self.model = model
+        self.piper_bin = piper_bin
+        self.sample_rate = piper_sample_rate(model)
+        self.player_cmd = [arg.format(rate=self.sample_rate) for arg in player_cmd]
+        self.scales = {"length_scale": length_scale, "noise_scale": noise_scale, "noise_w": noise_w}
+        # no appended silence: it is not counted in piper's audio= and would shift every later cut
+        self.synth_args = ["--sentence_silence", "0"]
+        for name, value in self.scales.items():
+            if value is not None:
+                self.synth_args += ["--" + name, str(value)]
+        self.cache = cache
+        self.listeners = []
+
+        self.text_queue = queue.Queue()
+        self.audio_queue = queue.Queue(maxsize=max_pending)
+        self.stdout_buf = bytearray()
+        self.stdout_cond = threading.Condition()
+        self.play_until = 0.0
+        self.generation = 0         # bumped by cancel(); queued items from older generations are dropped
+        self.piper = None
+        self.player = None
+        self.threads = []
+
+    def start(self):
+        if self.piper is not None:
+            return
+        self.piper = subprocess.Popen(
+            [self.piper_bin, "--model", self.model, "--output_raw"] + self.synth_args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.player = subprocess.Popen(
+            self.player_cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.threads = [
+            threading.Thread(target=target, daemon=True)
+            for target in (self._read_stdout, self._synth_loop, self._play_loop)
+        ]
+        for t in self.threads:
+            t.start()
+
+    def add_listener(self, fn):
+        self.listeners.append(fn)
+
+    def _emit(self, event, **info):
+        for fn in self.listeners:
+            try:
+                fn(event, **info)
+            except Exception as e:
+                print(f"⚠️ TTS listener failed: {e}")
+
+    def say(self, text):
+        """Queue text for speech and return immediately."""
+        self.start()
+        for sentence in split_sentences(text):
+            self.text_queue.put((self.generation, sentence))
+
+    def wait(self):
+        """Block until everything queued so far has been played."""
+        self.text_queue.join()
+        self.audio_queue.join()
+        remaining = self.play_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def speak(self, text):
+        self.say(text)
+        self.wait()
+
+    def cancel(self):
+        """Drop everything not yet handed to the player, including a sentence piper is working on."""
+        self.generation += 1
+        for q in (self.text_queue, self.audio_queue):
+            closing = False
+            while True:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+                closing = closing or item is None
+                q.task_done()
+            if closing:
+                # close() is waiting on this sentinel
+                q.put(None)
+        self.play_until = time.monotonic()
+
+    def close(self):
+        if self.piper is None:
+            return
+        self.text_queue.put(None)
+        reader, synth, play = self.threads
+        synth.join(timeout=5)
+        play.join(timeout=5)
+        for proc in (self.piper, self.player):
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+        reader.join(timeout=2)
+        for proc in (self.piper, self.player):
+            if proc.poll() is None:
+                proc.terminate()
+        self.piper = self.player = None
+        self.threads = []
+
+    def synthesize(self, sentence):
+        """Run one sentence through the resident piper and return its raw PCM."""
+        self.piper.stdin.write(sentence.replace("\n", " ").encode("utf-8") + b"\n")
+        self.piper.stdin.flush()
+
+        while True:
+            line = self.piper.stderr.readline()
+            if not line:
+                raise RuntimeError("piper exited")
+            m = RTF_LINE.search(line)
+            if m:
+                break
+        n_bytes = int(round(float(m.group(1)) * self.sample_rate)) * 2
+
+        with self.stdout_cond:
+            self.stdout_cond.wait_for(lambda: len(self.stdout_buf) >= n_bytes or self.piper.poll() is not None)
+            pcm = bytes(self.stdout_buf[:n_bytes])
+            del self.stdout_buf[:n_bytes]
+        return pcm
+
+    def cached_or_synthesize(self, sentence):
+        start = time.monotonic()
+        key = pcm = None
+        if self.cache is not None:
+            key = cache_key(sentence, self.model, self.sample_rate, sentence_silence=0, **self.scales)
+            pcm = self.cache.get(key)
+        cached = pcm is not None
+        if not cached:
+            pcm = self.synthesize(sentence)
+            if pcm and key is not None:
+                self.cache.put(key, pcm)
+        self._emit("synth", sentence=sentence, start=start, end=time.monotonic(), cached=cached)
+        return pcm
+
+    def _read_stdout(self):
+        stdout = self.piper.stdout
+        while True:
+            chunk = stdout.read1(65536)
+            with self.stdout_cond:
+                if chunk:
+                    self.stdout_buf += chunk
+                self.stdout_cond.notify_all()
+            if not chunk:
+                return
+
+    def _synth_loop(self):
+        while True:
+            item = self.text_queue.get()
+            sentence = None
+            try:
+                if item is None:
+                    self.audio_queue.put(None)
+                    return
+                generation, sentence = item
+                if generation != self.generation:
+                    continue
+                pcm = self.cached_or_synthesize(sentence)
+                # cancel() may have come in while piper was busy with it
+                if pcm and generation == self.generation:
+                    self.audio_queue.put((generation, sentence, pcm))
+            except (OSError, RuntimeError) as e:
+                print(f"❌ TTS failed for {sentence!r}: {e}")
+            finally:
+                self.text_queue.task_done()
+
+    def _play_loop(self):
+        bytes_per_sec = self.sample_rate * 2
+        while True:
+            item = self.audio_queue.get()
+            try:
+                if item is None:
+                    return
+                generation, sentence, pcm = item
+                if generation != self.generation:
+                    continue
+                start = max(time.monotonic(), self.play_until)
+                self.play_until = start + len(pcm) / bytes_per_sec
+                self._emit("play", sentence=sentence, pcm=pcm, start=start, duration=len(pcm) / bytes_per_sec)
+                self.player.stdin.write(pcm)
+                self.player.stdin.flush()
+            except OSError as e:
+                print(f"❌ Playback failed: {e}")
+            finally:
+                self.audio_queue.task_done()
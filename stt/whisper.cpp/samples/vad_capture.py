@@ -0,0 +1,255 @@
+"""VAD-endpointed microphone capture.
+
+Reads 16 kHz S16_LE frames from a long-running arecord into a ring buffer and
+runs Silero VAD over them (the ggml model written by
+models/convert-silero-vad-to-ggml.py, evaluated through libwhisper's
+whisper_vad_* API). An utterance starts on speech onset, keeps a short pre-roll
+and ends after a configurable run of trailing silence.
+"""
+
+import collections
+import ctypes
+import glob
+import os
+import subprocess
+import time
+
+import numpy as np
+
+WHISPER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIBWHISPER = os.path.join(WHISPER_DIR, "build", "src", "libwhisper.so")
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 512                     # Silero window at 16 kHz
+FRAME_MS = FRAME_SAMPLES * 1000 // SAMPLE_RATE
+
+Utterance = collections.namedtuple("Utterance", "pcm started ended")
+
+
+def find_vad_model(models_dir=os.path.join(WHISPER_DIR, "models")):
+    paths = sorted(glob.glob(os.path.join(models_dir, "*silero*.bin")))
+    real = [p for p in paths if not os.path.basename(p).startswith("for-tests")]
+    return (real or paths or [None])[-1]
+
+
+_LOG_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.c_int, ctypes.c_char_p, ctypes.c_void_p)
+_silent_log = _LOG_CALLBACK(lambda level, text, user_data: None)
+
+
+class _VadContextParams(ctypes.Structure):
+    _fields_ = [
+        ("n_threads", ctypes.c_int),
+        ("use_gpu", ctypes.c_bool),
+        ("gpu_device", ctypes.c_int),
+    ]
+
+
+class SileroVAD:
+    """Silero speech probabilities from the ggml model via libwhisper."""
+
+    def __init__(self, model_path=None, lib_path=LIBWHISPER, n_threads=1):
+        model_path = model_path or find_vad_model()
+        if not model_path or not os.path.exists(model_path):
+            raise FileNotFoundError(f"Silero VAD model not found: {model_path}")
+
+        lib = ctypes.CDLL(lib_path)
+        lib.whisper_vad_default_context_params.restype = _VadContextParams
+        lib.whisper_vad_init_from_file_with_params.argtypes = [ctypes.c_char_p, _VadContextParams]
+        lib.whisper_vad_init_from_file_with_params.restype = ctypes.c_void_p
+        lib.whisper_vad_detect_speech.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_float), ctypes.c_int]
+        lib.whisper_vad_detect_speech.restype = ctypes.c_bool
+        lib.whisper_vad_n_probs.argtypes = [ctypes.c_void_p]
+        lib.whisper_vad_n_probs.restype = ctypes.c_int
+        lib.whisper_vad_probs.argtypes = [ctypes.c_void_p]
+        lib.whisper_vad_probs.restype = ctypes.POINTER(ctypes.c_float)
+        lib.whisper_vad_free.argtypes = [ctypes.c_void_p]
+        # whisper_vad_detect_speech logs on every call; keep stderr quiet
+        lib.whisper_log_set.argtypes = [_LOG_CALLBACK, ctypes.c_void_p]
+        lib.whisper_log_set(_silent_log, None)
+
+        params = lib.whisper_vad_default_context_params()
+        params.n_threads = n_threads
+        params.use_gpu = False
+        self.ctx = lib.whisper_vad_init_from_file_with_params(model_path.encode("utf-8"), params)
+        if not self.ctx:
+            raise RuntimeError(f"failed to load Silero VAD model {model_path}")
+        self.lib = lib
+
+    def probs(self, samples):
+        """One speech probability per FRAME_SAMPLES window of float32 samples."""
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        ptr = samples.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
+        if not self.lib.whisper_vad_detect_speech(self.ctx, ptr, len(samples)):
+            return np.zeros(len(samples) // FRAME_SAMPLES, dtype=np.float32)
+        n = self.lib.whisper_vad_n_probs(self.ctx)
+        return np.ctypeslib.as_array(self.lib.whisper_vad_probs(self.ctx), shape=(n,)).copy()
+
+    def close(self):
+        if self.ctx:
+            self.lib.whisper_vad_free(self.ctx)
+            self.ctx = None
+
+
+class EnergyVAD:
+    """Fallback when libwhisper / the Silero model are unavailable: RMS level mapped to 0..1."""
+
+    def __init__(self, floor_dbfs=-50.0, ceil_dbfs=-25.0):
+        self.floor = floor_dbfs
+        self.ceil = ceil_dbfs
+
+    def probs(self, samples):
+        frames = samples[:len(samples) // FRAME_SAMPLES * FRAME_SAMPLES].reshape(-1, FRAME_SAMPLES)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)) + 1e-9
+        dbfs = 20.0 * np.log10(rms)
+        return np.clip((dbfs - self.floor) / (self.ceil - self.floor), 0.0, 1.0)
+
+    def close(self):
+        pass
+
+
+def load_vad(model_path=None):
+    try:
+        return SileroVAD(model_path)
+    except (OSError, RuntimeError, AttributeError) as e:
+        print(f"⚠️ Silero VAD unavailable ({e}), using energy VAD")
+        return EnergyVAD()
+
+
+class RingBuffer:
+    """Fixed-size int16 sample ring; latest(n) returns the newest n samples in order."""
+
+    def __init__(self, n_samples):
+        self.buf = np.zeros(n_samples, dtype=np.int16)
+        self.pos = 0
+        self.filled = 0
+
+    def write(self, samples):
+        n = len(samples)
+        end = self.pos + n
+        if end <= len(self.buf):
+            self.buf[self.pos:end] = samples
+        else:
+            split = len(self.buf) - self.pos
+            self.buf[self.pos:] = samples[:split]
+            self.buf[:n - split] = samples[split:]
+        self.pos = end % len(self.buf)
+        self.filled = min(len(self.buf), self.filled + n)
+
+    def latest(self, n):
+        n = min(n, self.filled)
+        start = self.pos - n
+        if start >= 0:
+            return self.buf[start:self.pos].copy()
+        return np.concatenate((self.buf[start:], self.buf[:self.pos]))
+
+
+class VADCapture:
+    def __init__(
+        self,
+        device="hw:2,0",
+        vad=None,
+        threshold=0.5,
+        pre_roll_ms=300,
+        silence_ms=500,
+        min_speech_ms=250,
+        max_utterance_s=15.0,
+        context_frames=16,
+        hop_frames=4,
+    ):
+        self.device = device
+        self.vad = vad or load_vad()
+        self.threshold = threshold
+        self.neg_threshold = max(0.0, threshold - 0.15)
+        self.pre_roll = pre_roll_ms * SAMPLE_RATE // 1000
+        self.silence_ms = silence_ms
+        self.min_speech_ms = min_speech_ms
+        self.max_samples = int(max_utterance_s * SAMPLE_RATE)
+        self.context = context_frames * FRAME_SAMPLES
+        self.hop_frames = hop_frames
+        self.ring = RingBuffer(max(self.context, self.pre_roll + hop_frames * FRAME_SAMPLES))
+        self.proc = None
+
+    def start(self):
+        if self.proc is None:
+            self.proc = subprocess.Popen([
+                "arecord",
+                "-D", self.device,
+                "-f", "S16_LE",
+                "-r", str(SAMPLE_RATE),
+                "-c", "1",
+                "-t", "raw",
+                "-q",
+            ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def stop(self):
+        """Stop arecord; a blocked record_utterance() raises EOFError."""
+        if self.proc is not None:
+            self.proc.terminate()
+            self.proc.wait()
+            self.proc = None
+
+    def close(self):
+        self.stop()
+        self.vad.close()
+
+    def read_frame(self):
+        proc = self.proc
+        if proc is None:
+            raise EOFError("arecord stopped")
+        data = proc.stdout.read(FRAME_SAMPLES * 2)
+        if len(data) < FRAME_SAMPLES * 2:
+            raise EOFError("arecord stopped")
+        return np.frombuffer(data, dtype=np.int16)
+
+    def hop_probs(self):
+        window = self.ring.latest(self.context).astype(np.float32) / 32768.0
+        return self.vad.probs(window)[-self.hop_frames:]
+
+    def record_utterance(self, timeout=None):
+        """Block until one utterance has been spoken; returns Utterance or None on timeout."""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        chunks = None
+        n_samples = 0
+        speech_ms = 0
+        silence_run = 0
+        started = None
+        hop_count = 0
+
+        while True:
+            frame = self.read_frame()
+            self.ring.write(frame)
+            if chunks is not None:
+                chunks.append(frame)
+                n_samples += len(frame)
+
+            hop_count += 1
+            if hop_count < self.hop_frames:
+                continue
+            hop_count = 0
+
+            probs = self.hop_probs()
+            if chunks is None:
+                if (probs >= self.threshold).any():
+                    onset = self.pre_roll + self.hop_frames * FRAME_SAMPLES
+                    chunks = [self.ring.latest(onset)]
+                    n_samples = len(chunks[0])
+                    started = time.monotonic() - n_samples / SAMPLE_RATE
+                    speech_ms = silence_run = 0
+                else:
+                    if deadline is not None and time.monotonic() > deadline:
+                        return None
+                    continue
+
+            for p in probs:
+                if p >= self.neg_threshold:
+                    speech_ms += FRAME_MS + silence_run
+                    silence_run = 0
+                else:
+                    silence_run += FRAME_MS
+
+            if silence_run >= self.silence_ms or n_samples >= self.max_samples:
+                if speech_ms >= self.min_speech_ms:
+                    pcm = np.concatenate(chunks).tobytes()
+                    return Utterance(pcm, started, time.monotonic())
+                chunks = None
@@ -0,0 +1,98 @@
+"""Wake-word gate in front of the full STT turn.
+
+The VAD already keeps silence away from whisper; this keeps background chatter
+away too. Only the first head_s seconds of each speech burst are decoded, with
+a shrunken encoder window (audio_ctx) and the pet's name as the initial prompt
+so whisper is biased towards spelling it the way we match it, the same trick
+the whisper.cpp `command` example uses for its activation phrase. The text is
+fuzzy-matched against the name and a few common mishearings.
+
+Once woken (or right after the pet has replied) the gate stays open for
+awake_s seconds so a follow-up does not need the name again.
+"""
+
+import difflib
+import re
+import time
+
+from stt_client import SAMPLE_RATE, transcribe
+
+WAKE_WORDS = ("pickcu", "pikachu", "pick you", "peek you")
+
+
+def normalize(text):
+    return " ".join(re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split())
+
+
+def best_match(text, wake_words=WAKE_WORDS, max_words=2, lead_words=3):
+    """Best (score, phrase) over the 1..max_words word windows in the first lead_words words of text.
+
+    The name is expected at the start ("Pickcu, ..." / "Hey Pickcu ..."), which
+    keeps a name mentioned mid-sentence on TV from waking the pet.
+    """
+    words = normalize(text).split()[:lead_words + max_words - 1]
+    best = (0.0, "")
+    for n in range(1, max_words + 1):
+        for i in range(len(words) - n + 1):
+            phrase = " ".join(words[i:i + n])
+            for wake in wake_words:
+                score = difflib.SequenceMatcher(None, phrase, wake).ratio()
+                if score > best[0]:
+                    best = (score, phrase)
+    return best
+
+
+class WakeGate:
+    def __init__(
+        self,
+        name="Pickcu",
+        wake_words=WAKE_WORDS,
+        threshold=0.82,
+        head_s=2.0,
+        awake_s=8.0,
+        wav_file="wake16k.wav",
+        language="en",
+        sample_rate=SAMPLE_RATE,
+    ):
+        self.name = name
+        self.wake_words = tuple(normalize(w) for w in wake_words)
+        self.threshold = threshold
+        self.head_s = head_s
+        self.awake_s = awake_s
+        self.wav_file = wav_file
+        self.language = language
+        self.sample_rate = sample_rate
+        # 50 encoder frames per second of audio, plus some slack
+        self.audio_ctx = min(1500, int(head_s * 50) + 64)
+        self.awake_until = 0.0
+
+    def is_awake(self):
+        return time.monotonic() < self.awake_until
+
+    def arm(self):
+        """Keep the gate open for the next awake_s seconds."""
+        self.awake_until = time.monotonic() + self.awake_s
+
+    def sleep(self):
+        self.awake_until = 0.0
+
+    def check(self, pcm):
+        """Decode the head of a speech burst; returns (woken, text heard)."""
+        head = pcm[:int(self.head_s * self.sample_rate) * 2]
+        text = transcribe(
+            head,
+            self.wav_file,
+            sample_rate=self.sample_rate,
+            language=self.language,
+            prompt=self.name,
+            audio_ctx=self.audio_ctx,
+        )
+        score, _ = best_match(text, self.wake_words)
+        return score >= self.threshold, text
+
+    def only_name(self, pcm, text):
+        """True if the whole burst was just the wake word ("Pickcu?")."""
+        if len(pcm) > int(self.head_s * self.sample_rate) * 2:
+            return False
+        words = normalize(text).split()
+        return len(words) <= 2 and best_match(text, self.wake_words)[0] >= self.threshold